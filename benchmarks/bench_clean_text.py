@@ -0,0 +1,70 @@
+"""
+Micro-benchmark for clean_text: the current single-pass normalizer versus the
+previous repeated-replace implementation, on the real debug/*.txt extractions.
+
+Run from the repository root:
+    python benchmarks/bench_clean_text.py [--repeat N] [--pad N]
+
+The "padded" variant widens every space to --pad spaces, the way docx form
+fields pad their contents, which is the worst case for the old loop.
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaning import clean_lines  # noqa: E402
+
+
+def legacy_clean_lines(text):
+    """The previous clean_text followed by splitlines(), as main() used it."""
+    if not text:
+        return []
+    text = text.replace('\t', ' ')
+    while '  ' in text:
+        text = text.replace('  ', ' ')
+    return text.strip().splitlines()
+
+
+def legacy_equivalent_lines(text):
+    """The previous implementation plus the per-line strip and blank-line drop
+    needed to produce the same lines as clean_lines (ignoring Unicode spaces)."""
+    return [line for line in map(str.strip, legacy_clean_lines(text)) if line]
+
+
+def _throughput(func, text, repeat):
+    seconds = min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+    return len(text.encode('utf-8')) / seconds / (1024 * 1024)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions; the best is reported.")
+    parser.add_argument("--pad", type=int, default=16, help="Spaces per space in the padded variant.")
+    args = parser.parse_args(argv)
+
+    debug_files = sorted(glob.glob(os.path.join("debug", "*.txt")))
+    if not debug_files:
+        print("No debug/*.txt files found; run from the repository root.")
+        return 1
+
+    print("Throughput in MB/s (best of --repeat runs).")
+    print(f"{'file':<40} {'variant':<7} {'legacy':>8} {'legacy+strip':>13} {'current':>8} {'vs legacy+strip':>16}")
+    for path in debug_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        variants = {'plain': text, 'padded': text.replace(' ', ' ' * args.pad)}
+        for name, sample in variants.items():
+            legacy = _throughput(legacy_clean_lines, sample, args.repeat)
+            equivalent = _throughput(legacy_equivalent_lines, sample, args.repeat)
+            current = _throughput(clean_lines, sample, args.repeat)
+            print(f"{os.path.basename(path):<40} {name:<7} {legacy:>8.1f} {equivalent:>13.1f} {current:>8.1f} "
+                  f"{current / equivalent:>15.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Benchmark for the section parser: the precompiled SectionParser behind
+parse_section versus the previous per-call implementation, over every section
+of the sample evaluations. Outputs are checked for equality before timing.
+
+Run from the repository root:
+    python benchmarks/bench_parse_section.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charter_eval_compiler import build_header_index, extract_cleaned_text, load_templates, split_document  # noqa: E402
+from section_parser import parse_section  # noqa: E402
+
+
+def _legacy_format_page_numbers(comment_text):
+    """Finds and reformats page number mentions in comment text."""
+    pattern = r'\b(?:page|p\. |p\.|pg\.)\s*(\d+)(?:\s*-\s*(\d+))?\b'
+    def replace_match(match):
+        start_page = match.group(1)
+        end_page = match.group(2)
+        if end_page:
+            return f'[p. {start_page}-{end_page}]'
+        return f'[p. {start_page}]'
+    return re.sub(pattern, replace_match, comment_text, flags=re.IGNORECASE)
+
+def legacy_parse_section(section_text, reviewer_name):
+    """
+    Parses a single section's text to extract strengths and concerns
+    based on Style A or a more complex, multi-line Style B/C formatting.
+    """
+    strengths = []
+    concerns = []
+
+    # Attempt Style A: A block of strengths followed by a block of concerns.
+    style_a_strength_pattern = re.compile(r'Strengths\n(.*?)(?=\nConcerns and Additional Questions|$)', re.DOTALL | re.IGNORECASE)
+    style_a_concern_pattern = re.compile(r'Concerns and Additional Questions\n(.*)', re.DOTALL | re.IGNORECASE)
+
+    match_strength_a = style_a_strength_pattern.search(section_text)
+    match_concern_a = style_a_concern_pattern.search(section_text)
+
+    if match_strength_a or match_concern_a:
+        if match_strength_a:
+            # Treat the entire block as one comment, then split by lines that seem to be new points if needed.
+            # For now, let's assume a simple line split works.
+            for line in match_strength_a.group(1).strip().splitlines():
+                if line.strip():
+                    strengths.append(line.strip())
+        if match_concern_a:
+            for line in match_concern_a.group(1).strip().splitlines():
+                if line.strip():
+                    concerns.append(line.strip())
+    else:
+        # Fallback to Style B/C: A state machine for line-by-line parsing.
+        current_mode = None  # Can be 'strength' or 'concern'
+        current_comment_lines = []
+
+        def save_current_comment():
+            if current_comment_lines:
+                comment = "\n".join(current_comment_lines).strip()
+                if comment:
+                    if current_mode == 'strength':
+                        strengths.append(comment)
+                    elif current_mode == 'concern':
+                        concerns.append(comment)
+                current_comment_lines.clear()
+
+        for line in section_text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            
+            line_lower = line.lower()
+
+            if line_lower == 'strength':
+                save_current_comment()
+                current_mode = 'strength'
+            elif line_lower == 'concern' or line_lower == 'question' or line_lower == 'follow up' or line_lower == 'improvement':
+                save_current_comment()
+                current_mode = 'concern'
+            elif line_lower.startswith("strength:"):
+                save_current_comment()
+                current_mode = 'strength'
+                comment_text = line.split(':', 1)[1].strip()
+                if comment_text:
+                    current_comment_lines.append(comment_text)
+            elif line_lower.startswith("concern:") or line_lower.startswith("question:") or line_lower.startswith("follow up:") or line_lower.startswith("improvement:"):
+                save_current_comment()
+                current_mode = 'concern'
+                comment_text = line.split(':', 1)[1].strip()
+                if comment_text:
+                    current_comment_lines.append(comment_text)
+            elif current_mode:
+                # This line is part of the ongoing comment
+                current_comment_lines.append(line)
+
+        # Save any remaining comment after the loop finishes
+        save_current_comment()
+
+    # Apply page number formatting and deduplicate
+    unique_strengths = []
+    seen_strengths_text = set()
+    for s_text in strengths:
+        formatted_s_text = _legacy_format_page_numbers(s_text)
+        if formatted_s_text and formatted_s_text not in seen_strengths_text:
+            unique_strengths.append({'reviewer': reviewer_name, 'comment': formatted_s_text})
+            seen_strengths_text.add(formatted_s_text)
+
+    unique_concerns = []
+    seen_concerns_text = set()
+    for c_text in concerns:
+        formatted_c_text = _legacy_format_page_numbers(c_text)
+        if formatted_c_text and formatted_c_text not in seen_concerns_text:
+            unique_concerns.append({'reviewer': reviewer_name, 'comment': formatted_c_text})
+            seen_concerns_text.add(formatted_c_text)
+
+    return {'strengths': unique_strengths, 'concerns': unique_concerns}
+
+
+def load_sample_sections():
+    """Returns (section_text, reviewer) pairs for every section of evaluations/*.docx."""
+    boilerplate = load_templates("templates")
+    header_index = build_header_index()
+    samples = []
+    for file_path in sorted(glob.glob(os.path.join("evaluations", "*.docx"))):
+        text, _ = extract_cleaned_text(file_path)
+        if not text:
+            continue
+        reviewer = os.path.splitext(os.path.basename(file_path))[0].rsplit('_', 1)[-1]
+        _, sections = split_document(text.splitlines(), header_index, boilerplate)
+        for section_text in sections.values():
+            samples.append((section_text, reviewer))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions; the best is reported.")
+    args = parser.parse_args(argv)
+
+    samples = load_sample_sections()
+    if not samples:
+        print("No sections found in evaluations/*.docx; run from the repository root.")
+        return 1
+
+    for section_text, reviewer in samples:
+        if parse_section(section_text, reviewer) != legacy_parse_section(section_text, reviewer):
+            print("Output mismatch between parse_section and the legacy implementation.")
+            return 1
+
+    def run(func):
+        for section_text, reviewer in samples:
+            func(section_text, reviewer)
+
+    total_bytes = sum(len(text.encode('utf-8')) for text, _ in samples)
+    legacy = min(timeit.repeat(lambda: run(legacy_parse_section), number=1, repeat=args.repeat))
+    current = min(timeit.repeat(lambda: run(parse_section), number=1, repeat=args.repeat))
+    print(f"{len(samples)} sections, {total_bytes / 1024:.0f} KiB, identical output.")
+    print(f"legacy : {legacy * 1000:8.2f} ms  ({len(samples) / legacy:9.0f} sections/s)")
+    print(f"current: {current * 1000:8.2f} ms  ({len(samples) / current:9.0f} sections/s)")
+    print(f"speedup: {legacy / current:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Times each stage of the compiler pipeline on its own and writes the results as JSON.
+
+Stages: loading the boilerplate templates, .docx extraction (docx2txt and the
+streaming reader), clean_text, section splitting, parse_section, comment
+aggregation, generate_markdown_report and each other report format. Each stage
+is timed on the output of the previous one, best of --repeat runs, then run
+once more under tracemalloc for its peak Python allocation. The process's peak RSS is recorded as well.
+
+Run from the repository root, on the sample evaluations or a synthetic corpus
+made by make_corpus.py:
+    python benchmarks/bench_pipeline.py [--corpus DIR] [--repeat N] [--output PATH]
+    python benchmarks/bench_pipeline.py --corpus /tmp/corpus --compare old.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx2txt  # noqa: E402
+
+from charter_eval_compiler import (  # noqa: E402
+    EXTRACTOR_VERSION, FILENAME_PATTERN, PARSER_VERSION, build_header_index, canonical_section_order,
+    generate_markdown_report, list_evaluation_files, load_templates, merge_file_result,
+    school_of, split_document,
+)
+from comment_aggregator import CommentAggregator  # noqa: E402
+from docx_stream import iter_docx_lines  # noqa: E402
+from report_writers import REPORT_FORMATS, write_report  # noqa: E402
+from section_parser import parse_section  # noqa: E402
+from text_cleaning import clean_text  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "pipeline.json")
+
+
+def peak_rss_kib():
+    """The process's peak resident set size in KiB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(func, repeat):
+    """
+    Returns (best seconds, peak traced KiB, result) for func(). The pipeline's
+    progress messages are silenced so they neither clutter nor slow the timing.
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+        tracemalloc.start()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak // 1024, result
+
+
+def reviewer_of(file_path):
+    return FILENAME_PATTERN.match(os.path.basename(file_path)).group(3).replace("_", " ")
+
+
+def run_stages(evaluation_files, template_dir, repeat, report_dir):
+    """Runs every stage in order and returns (stage results, corpus statistics)."""
+    stages = {}
+
+    def stage(name, func, items, nbytes=None):
+        seconds, peak_kib, result = measure(func, repeat)
+        stages[name] = {
+            "seconds": seconds,
+            "items": items,
+            "items_per_second": items / seconds if seconds else None,
+            "mib_per_second": nbytes / seconds / (1024 * 1024) if nbytes and seconds else None,
+            "peak_alloc_kib": peak_kib,
+        }
+        print(f"{name:<18}{seconds * 1000:10.2f} ms {items / seconds if seconds else 0:12.0f} items/s "
+              f"{peak_kib:10d} KiB peak")
+        return result
+
+    file_bytes = sum(os.path.getsize(p) for p in evaluation_files)
+    header_index = build_header_index()
+
+    boilerplate = stage("load_templates", lambda: load_templates(template_dir), 1)
+    raw_texts = stage("extract_docx2txt", lambda: [docx2txt.process(p) for p in evaluation_files],
+                      len(evaluation_files), file_bytes)
+    stream_lines = stage("extract_stream", lambda: [list(iter_docx_lines(p)) for p in evaluation_files],
+                         len(evaluation_files), file_bytes)
+    text_bytes = sum(len(t.encode("utf-8")) for t in raw_texts)
+    cleaned = stage("clean_text", lambda: [clean_text(t) for t in raw_texts], len(raw_texts), text_bytes)
+    if [t.splitlines() for t in cleaned] != stream_lines:
+        raise SystemExit("The docx2txt and streaming readers disagree on this corpus.")
+
+    lines = [t.splitlines() for t in cleaned]
+    line_count = sum(map(len, lines))
+    split = stage("split_sections", lambda: [split_document(l, header_index, boilerplate) for l in lines],
+                  line_count)
+
+    reviewers = [reviewer_of(p) for p in evaluation_files]
+    sections = [(reviewer, key, text)
+                for reviewer, (_, doc_sections) in zip(reviewers, split)
+                for key, text in doc_sections.items()]
+    parsed = stage("parse_section", lambda: [parse_section(text, reviewer) for reviewer, _, text in sections],
+                   len(sections))
+
+    results = []
+    parsed_iter = iter(parsed)
+    for file_path, reviewer, (app_type, doc_sections) in zip(evaluation_files, reviewers, split):
+        results.append({
+            "filename": os.path.basename(file_path), "status": "ok", "school": school_of(file_path),
+            "reviewer": reviewer, "app_type": app_type,
+            "sections": [(key, next(parsed_iter)) for key in doc_sections],
+        })
+    comment_count = sum(len(p["strengths"]) + len(p["concerns"]) for p in parsed)
+
+    def aggregate():
+        aggregator = CommentAggregator()
+        for result in results:
+            merge_file_result(aggregator, result, verbose=False)
+        return aggregator
+    aggregator = stage("aggregate", aggregate, comment_count)
+
+    canonical_order = canonical_section_order()
+    report_path = os.path.join(report_dir, "report.md")
+    stage("report", lambda: generate_markdown_report(aggregator.sections, report_path, canonical_order),
+          comment_count - aggregator.duplicates)
+    for fmt in REPORT_FORMATS:
+        if fmt != "md":
+            path = os.path.join(report_dir, "report." + fmt)
+            stage(f"report_{fmt}", lambda: write_report(aggregator.sections, canonical_order, path, fmt),
+                  comment_count - aggregator.duplicates)
+
+    corpus = {
+        "files": len(evaluation_files),
+        "schools": len({r["school"] for r in results}),
+        "file_bytes": file_bytes,
+        "text_bytes": text_bytes,
+        "lines": line_count,
+        "sections": len(sections),
+        "comments": comment_count,
+        "duplicates": aggregator.duplicates,
+        "report_bytes": os.path.getsize(report_path),
+    }
+    return stages, corpus
+
+
+def compare(current, previous_path):
+    """Prints each stage's time and peak allocation relative to a previous results file."""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    if previous.get("corpus") != current["corpus"]:
+        print("Warning: the previous results were measured on a different corpus.")
+    print(f"\nCompared with {previous_path} (ratio > 1 means slower / larger now):")
+    for name, stage in current["stages"].items():
+        old = previous.get("stages", {}).get(name)
+        if not old:
+            print(f"  {name:<18} (new stage)")
+            continue
+        time_ratio = stage["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        mem_ratio = stage["peak_alloc_kib"] / old["peak_alloc_kib"] if old["peak_alloc_kib"] else float("inf")
+        print(f"  {name:<18} time {time_ratio:6.2f}x   peak alloc {mem_ratio:6.2f}x")
+    if current["peak_rss_kib"] and previous.get("peak_rss_kib"):
+        print(f"  {'peak RSS':<18} {current['peak_rss_kib'] / previous['peak_rss_kib']:6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=".",
+                        help="Directory containing evaluations/ and templates/ (default: the repository root).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions; the best is reported.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Results file (default: {DEFAULT_OUTPUT}).")
+    parser.add_argument("--compare", metavar="PATH", help="A previous results file to compare against.")
+    args = parser.parse_args(argv)
+
+    evaluation_files = list_evaluation_files(os.path.join(args.corpus, "evaluations"))
+    if not evaluation_files:
+        print(f"No .docx files found in {os.path.join(args.corpus, 'evaluations')}.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as report_dir:
+        stages, corpus = run_stages(evaluation_files, os.path.join(args.corpus, "templates"),
+                                    args.repeat, report_dir)
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "versions": {"extractor": EXTRACTOR_VERSION, "parser": PARSER_VERSION},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "corpus": corpus,
+        "stages": stages,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+    print(f"\n{corpus['files']} files, {corpus['schools']} schools, {corpus['sections']} sections, "
+          f"{corpus['comments']} comments; peak RSS {results['peak_rss_kib']} KiB.")
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Generates a synthetic evaluation corpus for benchmarking the compiler pipeline.
+
+Writes <out>/evaluations/<School>_Eval_<Reviewer>.docx for every school and
+reviewer, plus one blank template per application type in <out>/templates/,
+so the corpus can be fed to the compiler or to bench_pipeline.py:
+
+    python benchmarks/make_corpus.py --out /tmp/corpus --schools 20 --reviewers 5
+    python benchmarks/bench_pipeline.py --corpus /tmp/corpus
+
+Documents look like real feedback forms: a title block that identifies the
+application type, the template's instructions and per-section prompts, then
+the reviewer's comments in Style A ("Strengths" / "Concerns and Additional
+Questions" blocks), Style B ("Strength" / "Concern" label lines) or Style C
+("Strength: ..." / "Question: ..." inline labels). The corpus is fully
+determined by the arguments and --seed. An existing corpus in <out> is only
+replaced with --force, which deletes it first, so files from an earlier run
+never mix into the new one.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+
+from section_definitions import basic_model_app, virtual_model_app, high_performing_app  # noqa: E402
+
+APP_TYPES = {
+    "standard": (basic_model_app, "Standard Charter Application"),
+    "virtual": (virtual_model_app, "Virtual Charter Application"),
+    "high_performing": (high_performing_app, "High-Performing Charter School System Replication Application"),
+}
+STYLES = ("A", "B", "C")
+
+INSTRUCTIONS = [
+    "Review Team Feedback Notes",
+    "The review team uses this form to record notes and feedback on the charter application.",
+    "Each section presents criteria for a response that meets the standard, and these criteria "
+    "should guide your consideration of each section.",
+    "Mark each comment as a Question, Strength, Concern, or Follow Up and explain your rationale.",
+]
+
+WORDS = (
+    "the applicant plan budget staffing curriculum students school board enrollment data assessment "
+    "teachers community facility transportation policy evidence timeline goals instruction support "
+    "services academic growth families outreach governance oversight training calendar partners "
+    "reading math science literacy intervention schedule capacity funding revenue expenses reserve "
+    "clear detailed limited unclear strong realistic aligned consistent vague ambitious measurable "
+    "describes includes lacks explains provides omits addresses supports demonstrates references"
+).split()
+
+
+def section_prompts(title):
+    """The template's criteria lines for one section."""
+    topic = title.split(":", 1)[-1].strip().lower()
+    return [
+        "The reviewer should evaluate whether the response meets the standard.",
+        f"A response that meets the standard for {topic} presents a clear, realistic and coherent plan "
+        "that is aligned with the mission and supported by evidence.",
+        f"Reference specific pages of the application when commenting on {topic}.",
+    ]
+
+
+def make_comment(rng):
+    """A random reviewer comment, sometimes with a page reference and a second sentence."""
+    words = rng.sample(WORDS, rng.randint(8, 24))
+    comment = " ".join(words).capitalize() + "."
+    if rng.random() < 0.3:
+        start = rng.randint(1, 300)
+        comment += f" See page {start}" + (f"-{start + rng.randint(1, 9)}." if rng.random() < 0.5 else ".")
+    return comment
+
+
+def template_lines(app_type):
+    definitions, title = APP_TYPES[app_type]
+    lines = [title] + INSTRUCTIONS
+    for variations in definitions().values():
+        lines.append(variations[0])
+        lines.extend(section_prompts(variations[0]))
+    return lines
+
+
+def comment_lines(style, strengths, concerns, rng):
+    """Renders one section's comments in the given style."""
+    if style == "A":
+        return ["Strengths"] + strengths + ["Concerns and Additional Questions"] + concerns
+    lines = []
+    labelled = [("Strength", c) for c in strengths]
+    labelled += [(rng.choice(("Concern", "Question", "Follow Up")), c) for c in concerns]
+    for label, comment in labelled:
+        if style == "B":
+            lines.append(label)
+            # Style B comments may continue over several lines.
+            lines.extend(comment.split(". ", 1) if rng.random() < 0.3 else [comment])
+        else:
+            lines.append(f"{label}: {comment}")
+    return lines
+
+
+def evaluation_lines(app_type, style, comments, shared, duplicate_rate, rng):
+    """
+    Lines of one reviewer's evaluation. shared maps (section, kind) to comments
+    other reviewers of the same school already made; with probability
+    duplicate_rate a comment is copied from there, so de-duplication is exercised.
+    """
+    definitions, _ = APP_TYPES[app_type]
+    lines = template_lines(app_type)[:1 + len(INSTRUCTIONS)]
+    for section_key, variations in definitions().items():
+        lines.append(variations[0])
+        lines.extend(section_prompts(variations[0]))
+        by_kind = {}
+        for kind in ("strengths", "concerns"):
+            pool = shared.setdefault((section_key, kind), [])
+            picked = []
+            for _ in range(comments):
+                if pool and rng.random() < duplicate_rate:
+                    picked.append(rng.choice(pool))
+                else:
+                    picked.append(make_comment(rng))
+                    pool.append(picked[-1])
+            by_kind[kind] = picked
+        lines.extend(comment_lines(style, by_kind["strengths"], by_kind["concerns"], rng))
+    return lines
+
+
+def write_docx(lines, path):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def parse_mix(text, names):
+    """Parses 'A=2,B=1' style weights; names left out get weight 0."""
+    weights = dict.fromkeys(names, 0.0)
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name not in weights:
+            raise argparse.ArgumentTypeError(f"unknown name '{name}' (expected one of {', '.join(names)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="Output directory (evaluations/ and templates/ are created in it).")
+    parser.add_argument("--schools", type=int, default=10, help="Number of schools (default: 10).")
+    parser.add_argument("--reviewers", type=int, default=5, help="Reviewers per school (default: 5).")
+    parser.add_argument("--comments", type=int, default=3,
+                        help="Strengths and concerns per section per reviewer (default: 3).")
+    parser.add_argument("--styles", default="A=1,B=1,C=1",
+                        help="Relative weights of comment styles A, B and C (default: A=1,B=1,C=1).")
+    parser.add_argument("--app-types", default="standard=1,virtual=1,high_performing=1",
+                        help="Relative weights of application types (default: all equal).")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1,
+                        help="Chance that a comment repeats another reviewer's for the same school (default: 0.1).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1).")
+    parser.add_argument("--force", action="store_true",
+                        help="Delete an existing corpus in --out (its evaluations/, templates/ and corpus.json) first.")
+    args = parser.parse_args(argv)
+
+    style_weights = parse_mix(args.styles, STYLES)
+    type_weights = parse_mix(args.app_types, list(APP_TYPES))
+    rng = random.Random(args.seed)
+
+    evaluation_dir = os.path.join(args.out, "evaluations")
+    template_dir = os.path.join(args.out, "templates")
+    manifest_path = os.path.join(args.out, "corpus.json")
+    existing = [d for d in (evaluation_dir, template_dir) if os.path.isdir(d) and os.listdir(d)]
+    if os.path.exists(manifest_path):
+        existing.append(manifest_path)
+    if existing:
+        if not args.force:
+            parser.error(f"{args.out} already holds a corpus ({', '.join(existing)}); "
+                         "pass --force to replace it or choose another --out.")
+        for path in existing:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+    os.makedirs(evaluation_dir, exist_ok=True)
+    os.makedirs(template_dir, exist_ok=True)
+
+    for app_type, (_, title) in APP_TYPES.items():
+        if type_weights[app_type]:
+            write_docx(template_lines(app_type), os.path.join(template_dir, title + ".docx"))
+
+    counts = dict.fromkeys(APP_TYPES, 0)
+    for school in range(1, args.schools + 1):
+        app_type = rng.choices(list(type_weights), weights=list(type_weights.values()))[0]
+        counts[app_type] += 1
+        shared = {}
+        for reviewer in range(1, args.reviewers + 1):
+            style = rng.choices(STYLES, weights=[style_weights[s] for s in STYLES])[0]
+            lines = evaluation_lines(app_type, style, args.comments, shared, args.duplicate_rate, rng)
+            filename = f"School_{school:04d}_Eval_Reviewer_{reviewer:02d}.docx"
+            write_docx(lines, os.path.join(evaluation_dir, filename))
+        print(f"\rGenerated {school}/{args.schools} schools", end="", flush=True)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"arguments": vars(args), "schools_by_app_type": counts}, f, indent=2)
+    print(f"\nWrote {args.schools * args.reviewers} evaluations to {evaluation_dir} "
+          f"({', '.join(f'{n} {t}' for t, n in counts.items())} schools).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
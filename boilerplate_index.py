@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import sys
+import zlib
+from array import array
+from itertools import islice
+
+INDEX_FORMAT = 1
+TEMPLATE_EXTENSIONS = ('.docx', '.doc')
+
+# Lines with at least this many words are also compared by SHINGLE_WORDS-word
+# shingles, so a prompt line that a reviewer truncated or lightly edited is still dropped.
+# Shorter lines (keywords like "Strength", names, dates) must match exactly.
+FUZZY_MIN_WORDS = 8
+SHINGLE_WORDS = 4  # _shingle_hashes and _mostly_template_shingles unroll this width
+FUZZY_MIN_OVERLAP = 0.8
+# Template prompts recur in every evaluation, so membership results are memoized
+# per line. The memo is cleared when it reaches this many lines, which bounds it
+# when many distinct reviewer comments pass through one long-lived index.
+MEMO_MAX_LINES = 65536
+
+
+def hash64(text):
+    """Stable 64-bit hash of a string (unlike hash(), identical across processes and runs)."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def normalize_line(line):
+    """Case-folds a cleaned line and collapses its whitespace."""
+    return ' '.join(line.casefold().split())
+
+
+_MASK64 = (1 << 64) - 1
+_SHINGLE_PRIME = 0x100000001B3
+# Names how hash64, normalize_line and _shingle_hashes turn text into stored
+# values; change it whenever any of them changes so saved indexes are rebuilt.
+HASH_SCHEME = "blake2b64-casefold+crc32-fnv-shingle"
+
+
+def _shingle_hashes(normalized):
+    """
+    64-bit hashes of every run of SHINGLE_WORDS consecutive words, built from
+    per-word CRC32s so each shingle costs a few integer operations, not a digest.
+    """
+    word_hashes = [zlib.crc32(word) for word in normalized.encode('utf-8').split(b' ')]
+    p = _SHINGLE_PRIME
+    return {
+        (((a * p + b) * p + c) * p + d) & _MASK64
+        for a, b, c, d in zip(word_hashes, word_hashes[1:], word_hashes[2:], word_hashes[3:])
+    }
+
+
+def discover_template_files(template_dir):
+    """Returns every .docx/.doc file in template_dir, matching extensions case-insensitively."""
+    if not os.path.isdir(template_dir):
+        return []
+    return sorted(
+        os.path.join(template_dir, name) for name in os.listdir(template_dir)
+        if name.lower().endswith(TEMPLATE_EXTENSIONS) and not name.startswith('~$')
+    )
+
+
+def template_signature(template_files):
+    """Size and mtime of each template; the persisted index is rebuilt when this changes."""
+    signature = {}
+    for path in template_files:
+        st = os.stat(path)
+        signature[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+    return signature
+
+
+class BoilerplateIndex:
+    """
+    Compact set of template ("boilerplate") lines, stored as 64-bit hashes of
+    normalized lines plus 64-bit hashes of word shingles from long lines.
+
+    Supports `line in index`, so it is a drop-in replacement for a set of lines:
+    a line is boilerplate if its normalized hash is in the index, or if it is long
+    enough and most of its word shingles come from template lines. Results are
+    memoized by line, so repeated prompts cost one dict lookup.
+    """
+
+    def __init__(self, line_hashes=(), shingle_hashes=(), fuzzy=True):
+        self.line_hashes = set(line_hashes)
+        self.shingle_hashes = set(shingle_hashes)
+        self.fuzzy = fuzzy
+        self.failed_templates = []  # set by load_templates; a saved index never has any
+        self._memo = {}
+
+    @classmethod
+    def from_lines(cls, lines, fuzzy=True):
+        index = cls(fuzzy=fuzzy)
+        for line in lines:
+            index.add(line)
+        return index
+
+    def add(self, line):
+        self._memo.clear()
+        normalized = normalize_line(line)
+        self.line_hashes.add(hash64(normalized))
+        if normalized.count(' ') + 1 >= FUZZY_MIN_WORDS:
+            self.shingle_hashes.update(_shingle_hashes(normalized))
+
+    def __len__(self):
+        return len(self.line_hashes)
+
+    def __contains__(self, line):
+        found = self._memo.get(line)
+        if found is None:
+            if len(self._memo) >= MEMO_MAX_LINES:
+                self._memo.clear()
+            found = self._memo[line] = self._lookup(line)
+        return found
+
+    def _lookup(self, line):
+        normalized = normalize_line(line)
+        if hash64(normalized) in self.line_hashes:
+            return True
+        if not self.fuzzy:
+            return False
+        if normalized.count(' ') + 1 < FUZZY_MIN_WORDS:
+            return False
+        return self._mostly_template_shingles(normalized)
+
+    def _mostly_template_shingles(self, normalized):
+        """
+        Whether at least FUZZY_MIN_OVERLAP of the line's distinct shingles are
+        template shingles. Shingles are hashed word by word and the check stops as
+        soon as the misses rule it out, so an ordinary comment line usually costs
+        only its first few words.
+        """
+        words = normalized.encode('utf-8').split(b' ')
+        # A line has at most this many distinct shingles, so once even all the
+        # others hitting could not reach the overlap, the line is not a prompt.
+        max_shingles = len(words) - SHINGLE_WORDS + 1
+        min_hits = FUZZY_MIN_OVERLAP * max_shingles
+        template_shingles = self.shingle_hashes
+        p = _SHINGLE_PRIME
+        crc32 = zlib.crc32
+        a, b, c = crc32(words[0]), crc32(words[1]), crc32(words[2])
+        seen = set()
+        misses = 0
+        for word in islice(words, SHINGLE_WORDS - 1, None):
+            d = crc32(word)
+            shingle = (((a * p + b) * p + c) * p + d) & _MASK64
+            a, b, c = b, c, d
+            if shingle in seen:
+                continue
+            seen.add(shingle)
+            if shingle not in template_shingles:
+                misses += 1
+                if max_shingles - misses < min_hits:
+                    return False
+        return len(seen) - misses >= FUZZY_MIN_OVERLAP * len(seen)
+
+    def fingerprint(self):
+        """A stable digest of the index contents, for invalidating stored results."""
+        h = hashlib.sha256()
+        h.update(f"{self.fuzzy}\0".encode('utf-8'))
+        h.update(array('Q', sorted(self.line_hashes)).tobytes())
+        h.update(b'\0')
+        h.update(array('Q', sorted(self.shingle_hashes)).tobytes())
+        return h.hexdigest()
+
+    def save(self, path, version, signature):
+        """
+        Writes the index as one JSON header line followed by the raw little-endian
+        uint64 arrays, so loading is a single read and two array conversions.
+        """
+        lines = array('Q', sorted(self.line_hashes))
+        shingles = array('Q', sorted(self.shingle_hashes))
+        if sys.byteorder != 'little':
+            lines.byteswap()
+            shingles.byteswap()
+        header = {
+            'format': INDEX_FORMAT, 'version': version, 'templates': signature,
+            'hash_scheme': HASH_SCHEME, 'min_words': FUZZY_MIN_WORDS, 'shingle_words': SHINGLE_WORDS,
+            'lines': len(lines), 'shingles': len(shingles),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            f.write(lines.tobytes())
+            f.write(shingles.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, version, signature, fuzzy=True):
+        """
+        Returns the persisted index if it matches version, the template signature
+        and this module's hashing parameters, else None.
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        header_end = data.find(b'\n')
+        try:
+            header = json.loads(data[:header_end])
+        except ValueError:
+            return None
+        if (header.get('format') != INDEX_FORMAT or header.get('version') != version
+                or header.get('templates') != signature
+                or header.get('hash_scheme') != HASH_SCHEME
+                or header.get('min_words') != FUZZY_MIN_WORDS
+                or header.get('shingle_words') != SHINGLE_WORDS):
+            return None
+
+        values = array('Q')
+        values.frombytes(data[header_end + 1:])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        if len(values) != header['lines'] + header['shingles']:
+            return None
+        return cls(values[:header['lines']], values[header['lines']:], fuzzy=fuzzy)
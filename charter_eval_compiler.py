@@ -1,11 +1,38 @@
+import argparse
+import functools
+import hashlib
 import os
 import re
-import docx2txt
+import time
 import glob
-from section_definitions import basic_model_app, virtual_model_app, high_performing_app
+from itertools import chain, islice
+from boilerplate_index import BoilerplateIndex, discover_template_files, template_signature
+from comment_aggregator import COMMENT_KINDS, CommentAggregator
+from debug_output import DEBUG_LEVELS, open_debug_writer
+from extraction_cache import ExtractionCache
+from header_index import HeaderIndex
+from report_writers import REPORT_FORMATS, write_report
+from result_manifest import ResultManifest
+from run_metrics import RunMetrics, file_metrics, profiling
+from section_definitions import section_table, section_title
+from text_cleaning import clean_text
+
+# Modules only some runs need (docx2txt, the .docx stream reader, the section
+# parser, LibreOffice conversion, asyncio for watch mode) are imported where they
+# are used, so a run whose results are all cached starts without loading them.
+
+# Bump whenever extract_text_from_docx, iter_docx_lines or clean_text output
+# changes so cached text from an older extractor is never reused. Both readers
+# produce identical lines, so they share cache entries.
+EXTRACTOR_VERSION = "docx2txt/clean_text-2"
+READERS = ("stream", "docx2txt")
+# Bump whenever split_sections or parse_section output changes so stored
+# per-file results in the manifest are re-parsed.
+PARSER_VERSION = "sections/parse_section-2"
 
 def extract_text_from_docx(file_path):
     """Extracts raw text from a .docx file using docx2txt."""
+    import docx2txt
     try:
         text = docx2txt.process(file_path)
         return text
@@ -13,306 +40,901 @@ def extract_text_from_docx(file_path):
         print(f"Error extracting text from {file_path}: {e}")
         return None
 
-def clean_text(text):
+def stream_cleaned_lines(file_path, errors):
     """
-    Normalizes whitespace by replacing tabs and multiple spaces with a single space.
+    Yields cleaned lines straight from the .docx zip stream via iter_docx_lines.
+    Extraction errors are reported and appended to errors instead of raised.
     """
-    if not text:
-        return ""
-    text = text.replace('\t', ' ')
-    while '  ' in text:
-        text = text.replace('  ', ' ')
-    return text.strip()
+    from docx_stream import READ_ERRORS, iter_docx_lines
+    try:
+        yield from iter_docx_lines(file_path)
+    except READ_ERRORS as e:
+        print(f"Error extracting text from {file_path}: {e}")
+        errors.append(e)
+
+def _extract_docx2txt_text(file_path):
+    raw_text = extract_text_from_docx(file_path)
+    if not raw_text:
+        return None
+    return clean_text(raw_text)
+
+def _extract_stream_text(file_path):
+    errors = []
+    text = "\n".join(stream_cleaned_lines(file_path, errors))
+    if errors or not text:
+        return None
+    return text
+
+_TEXT_EXTRACTORS = {"stream": _extract_stream_text, "docx2txt": _extract_docx2txt_text}
+
+def _extract_legacy_doc_text(file_path, reader):
+    """Converts a legacy .doc to .docx with LibreOffice, then extracts it with reader."""
+    import tempfile
+    from extractor import convert_legacy_doc
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        docx_path = convert_legacy_doc(file_path, tmp_dir)
+        if not docx_path:
+            return None
+        return _TEXT_EXTRACTORS[reader](docx_path)
+
+def extract_cleaned_text(file_path, cache=None, reader="stream"):
+    """
+    Returns (cleaned_text, cache_record) for a .docx (or legacy .doc) file, using
+    the extraction cache when one is given. cleaned_text is None if extraction failed.
+    """
+    if file_path.lower().endswith('.doc'):
+        extract = functools.partial(_extract_legacy_doc_text, reader=reader)
+    else:
+        extract = _TEXT_EXTRACTORS[reader]
+    if cache is None:
+        return extract(file_path), None
+    return cache.get(file_path, extract)
 
-def load_templates(template_dir):
+def load_templates(template_dir, cache=None, reader="stream", fuzzy=True):
     """
     Loads and cleans boilerplate text from template files in the given directory.
-    Returns a set of unique, cleaned lines from all templates.
+    Returns a BoilerplateIndex of the cleaned lines from all templates. Templates
+    that could not be extracted are listed in its failed_templates.
     """
-    boilerplate_lines = set()
+    boilerplate = BoilerplateIndex(fuzzy=fuzzy)
     if not os.path.isdir(template_dir):
         print(f"Warning: Template directory '{template_dir}' not found. No boilerplate will be removed.")
-        return boilerplate_lines
+        return boilerplate
 
-    template_files = glob.glob(os.path.join(template_dir, '*.docx'))
+    template_files = discover_template_files(template_dir)
     if not template_files:
-        print(f"Warning: No .docx files found in template directory '{template_dir}'. No boilerplate will be removed.")
-        return boilerplate_lines
+        print(f"Warning: No .docx or .doc files found in template directory '{template_dir}'. No boilerplate will be removed.")
+        return boilerplate
 
+    loaded = 0
     for template_file in template_files:
-        raw_text = extract_text_from_docx(template_file)
-        if raw_text:
-            cleaned_text = clean_text(raw_text)
-            for line in cleaned_text.splitlines():
-                boilerplate_lines.add(line)
-    
-    print(f"Loaded {len(boilerplate_lines)} unique boilerplate lines from {len(template_files)} templates.")
-    return boilerplate_lines
-
-def _build_header_map():
-    """Builds a master map from every header variation to its canonical name."""
-    master_map = {}
-    header_defs = {
-        "standard": basic_model_app(),
-        "virtual": virtual_model_app(),
-        "high_performing": high_performing_app()
-    }
-    
-    for app_type, sections in header_defs.items():
-        for canonical_name, variations in sections.items():
-            for variation in variations:
-                master_map[clean_text(variation)] = canonical_name
-    return master_map
+        cleaned_text, _ = extract_cleaned_text(template_file, cache, reader)
+        if not cleaned_text:
+            boilerplate.failed_templates.append(template_file)
+            continue
+        loaded += 1
+        for line in cleaned_text.splitlines():
+            boilerplate.add(line)
+
+    print(f"Loaded {len(boilerplate)} unique boilerplate lines from {loaded} templates.")
+    if boilerplate.failed_templates:
+        names = ", ".join(os.path.basename(p) for p in boilerplate.failed_templates)
+        print(f"Warning: {len(boilerplate.failed_templates)} templates could not be read: {names}")
+    return boilerplate
+
+def load_boilerplate_index(template_dir, index_path=None, cache=None, reader="stream", fuzzy=True, rebuild=False):
+    """
+    Returns the BoilerplateIndex for template_dir. With index_path, the index is
+    loaded from disk when no template has changed since it was saved, and is
+    otherwise rebuilt from the templates and saved. An index missing a template
+    that failed to extract (e.g. a .doc without LibreOffice) is not saved, so the
+    next run tries that template again.
+    """
+    if index_path and not rebuild:
+        signature = template_signature(discover_template_files(template_dir))
+        boilerplate = BoilerplateIndex.load(index_path, EXTRACTOR_VERSION, signature, fuzzy)
+        if boilerplate is not None:
+            print(f"Loaded boilerplate index with {len(boilerplate)} lines from {len(signature)} templates.")
+            return boilerplate
+
+    boilerplate = load_templates(template_dir, cache, reader, fuzzy)
+    if index_path and boilerplate.failed_templates:
+        print("Not saving the boilerplate index until every template can be read.")
+    elif index_path:
+        signature = template_signature(discover_template_files(template_dir))
+        boilerplate.save(index_path, EXTRACTOR_VERSION, signature)
+    return boilerplate
+
+# Only the title block at the top of a document is used to detect its type, so
+# reviewer comments that mention other application types cannot change it.
+DETECTION_LINES = 25
+
+def build_header_index():
+    """Builds the per-application-type header matchers from the section table."""
+    table = section_table()
+    return HeaderIndex.from_definitions(table.variants, table.fingerprint)
+
+def canonical_section_order():
+    """Report order: the standard model's sections, then any only other types define."""
+    return section_table().order
 
 def _detect_application_type(text):
     """
     Detects the application type based on the presence of specific keywords.
     """
-    text_lower = text.lower()
-    if "virtual application" in text_lower:
+    text_lower = text.lower().replace('-', ' ')
+    if "virtual application" in text_lower or "virtual charter" in text_lower:
         return "virtual"
-    if "high performing replication" in text_lower:
+    if "high performing" in text_lower and "replication" in text_lower:
         return "high_performing"
     return "standard"
 
-def _format_page_numbers(comment_text):
-    """Finds and reformats page number mentions in comment text."""
-    pattern = r'\b(?:page|p\. |p\.|pg\.)\s*(\d+)(?:\s*-\s*(\d+))?\b'
-    def replace_match(match):
-        start_page = match.group(1)
-        end_page = match.group(2)
-        if end_page:
-            return f'[p. {start_page}-{end_page}]'
-        return f'[p. {start_page}]'
-    return re.sub(pattern, replace_match, comment_text, flags=re.IGNORECASE)
-
-def parse_section(section_text, reviewer_name):
-    """
-    Parses a single section's text to extract strengths and concerns
-    based on Style A or a more complex, multi-line Style B/C formatting.
-    """
-    strengths = []
-    concerns = []
-
-    # Attempt Style A: A block of strengths followed by a block of concerns.
-    style_a_strength_pattern = re.compile(r'Strengths\n(.*?)(?=\nConcerns and Additional Questions|$)', re.DOTALL | re.IGNORECASE)
-    style_a_concern_pattern = re.compile(r'Concerns and Additional Questions\n(.*)', re.DOTALL | re.IGNORECASE)
-
-    match_strength_a = style_a_strength_pattern.search(section_text)
-    match_concern_a = style_a_concern_pattern.search(section_text)
-
-    if match_strength_a or match_concern_a:
-        if match_strength_a:
-            # Treat the entire block as one comment, then split by lines that seem to be new points if needed.
-            # For now, let's assume a simple line split works.
-            for line in match_strength_a.group(1).strip().splitlines():
-                if line.strip():
-                    strengths.append(line.strip())
-        if match_concern_a:
-            for line in match_concern_a.group(1).strip().splitlines():
-                if line.strip():
-                    concerns.append(line.strip())
-    else:
-        # Fallback to Style B/C: A state machine for line-by-line parsing.
-        current_mode = None  # Can be 'strength' or 'concern'
-        current_comment_lines = []
-
-        def save_current_comment():
-            if current_comment_lines:
-                comment = "\n".join(current_comment_lines).strip()
-                if comment:
-                    if current_mode == 'strength':
-                        strengths.append(comment)
-                    elif current_mode == 'concern':
-                        concerns.append(comment)
-                current_comment_lines.clear()
-
-        for line in section_text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            
-            line_lower = line.lower()
-
-            if line_lower == 'strength':
-                save_current_comment()
-                current_mode = 'strength'
-            elif line_lower == 'concern' or line_lower == 'question' or line_lower == 'follow up' or line_lower == 'improvement':
-                save_current_comment()
-                current_mode = 'concern'
-            elif line_lower.startswith("strength:"):
-                save_current_comment()
-                current_mode = 'strength'
-                comment_text = line.split(':', 1)[1].strip()
-                if comment_text:
-                    current_comment_lines.append(comment_text)
-            elif line_lower.startswith("concern:") or line_lower.startswith("question:") or line_lower.startswith("follow up:") or line_lower.startswith("improvement:"):
-                save_current_comment()
-                current_mode = 'concern'
-                comment_text = line.split(':', 1)[1].strip()
-                if comment_text:
-                    current_comment_lines.append(comment_text)
-            elif current_mode:
-                # This line is part of the ongoing comment
-                current_comment_lines.append(line)
-
-        # Save any remaining comment after the loop finishes
-        save_current_comment()
-
-    # Apply page number formatting and deduplicate
-    unique_strengths = []
-    seen_strengths_text = set()
-    for s_text in strengths:
-        formatted_s_text = _format_page_numbers(s_text)
-        if formatted_s_text and formatted_s_text not in seen_strengths_text:
-            unique_strengths.append({'reviewer': reviewer_name, 'comment': formatted_s_text})
-            seen_strengths_text.add(formatted_s_text)
-
-    unique_concerns = []
-    seen_concerns_text = set()
-    for c_text in concerns:
-        formatted_c_text = _format_page_numbers(c_text)
-        if formatted_c_text and formatted_c_text not in seen_concerns_text:
-            unique_concerns.append({'reviewer': reviewer_name, 'comment': formatted_c_text})
-            seen_concerns_text.add(formatted_c_text)
-
-    return {'strengths': unique_strengths, 'concerns': unique_concerns}
-
 def generate_markdown_report(data, output_path, canonical_order):
-    """Generates the final Markdown report from the aggregated data."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("# Charter Application Review Comments Compilation\n\n")
-
-        for section_key in canonical_order:
-            if section_key in data:
-                comments_in_section = data[section_key]
-                if comments_in_section['strengths'] or comments_in_section['concerns']:
-                    section_title = comments_in_section.get('title', section_key) 
-                    f.write(f"## {section_title}\n\n")
-
-                    if comments_in_section['strengths']:
-                        f.write("### Strengths\n")
-                        sorted_strengths = sorted(comments_in_section['strengths'], key=lambda x: x['reviewer'])
-                        for comment_entry in sorted_strengths:
-                            f.write(f"- {comment_entry['reviewer']}: {comment_entry['comment']}\n")
-                        f.write("\n")
-
-                    if comments_in_section['concerns']:
-                        f.write("### Concerns\n")
-                        sorted_concerns = sorted(comments_in_section['concerns'], key=lambda x: x['reviewer'])
-                        for comment_entry in sorted_concerns:
-                            f.write(f"- {comment_entry['reviewer']}: {comment_entry['comment']}\n")
-                        f.write("\n")
+    """
+    Generates the final Markdown report from the aggregated data. The report is
+    written to a temporary file and moved into place, so it is never seen half-written.
+    """
+    write_report(data, canonical_order, output_path, 'md')
     print(f"\nMarkdown report generated at: {output_path}")
 
-def main():
+def generate_reports(data, output_base, canonical_order, formats, school=None):
+    """
+    Writes the report in each of formats to output_base plus the format's
+    extension, and returns the paths written. school, if given, is recorded in
+    the structured formats.
+    """
+    paths = []
+    for fmt in formats:
+        output_path = f"{output_base}.{fmt}"
+        write_report(data, canonical_order, output_path, fmt, school)
+        label = "Markdown" if fmt == "md" else fmt.upper()
+        print(f"\n{label} report generated at: {output_path}")
+        paths.append(output_path)
+    return paths
+
+FILENAME_PATTERN = re.compile(r'(.+)_Ev(al|anl)_(.+)\.docx', re.IGNORECASE)
+
+def list_evaluation_files(input_dir):
+    """
+    Returns the evaluation .docx files in input_dir, sorted so the merge order
+    (and therefore the report) does not depend on directory listing order.
+    Word's "~$" lock files are left out.
+    """
+    return sorted(p for p in glob.glob(os.path.join(input_dir, '*.docx'))
+                  if not os.path.basename(p).startswith('~$'))
+
+def split_sections(lines, match_header, boilerplate, stats=None):
+    """
+    Splits the cleaned lines of a document into sections keyed by canonical name.
+    match_header returns a line's canonical section key, or None if it is not a header.
+    Header lines are checked first so they are never dropped as boilerplate.
+    If stats is a dict, the number of headers matched and boilerplate lines
+    dropped are added to it.
+    """
+    sections = {}
+    current_section_key = None
+    current_content = []
+    headers = dropped = 0
+
+    for line in lines:
+        # Check if the line is a header FIRST
+        section_key = match_header(line)
+        if section_key is not None:
+            # If we were in a section, save its content
+            if current_section_key:
+                sections[current_section_key] = "\n".join(current_content)
+
+            # Start the new section
+            current_section_key = section_key
+            current_content = [] # Reset content for the new section
+            headers += 1
+
+        # If it's not a header, check if it's NOT boilerplate, then add it
+        elif current_section_key:
+            if line in boilerplate:
+                dropped += 1
+            else:
+                current_content.append(line)
+
+    # Save the very last section's content after the loop finishes
+    if current_section_key:
+        sections[current_section_key] = "\n".join(current_content)
+    if stats is not None:
+        stats['headers_matched'] = stats.get('headers_matched', 0) + headers
+        stats['boilerplate_dropped'] = stats.get('boilerplate_dropped', 0) + dropped
+    return sections
+
+def split_document(lines, header_index, boilerplate, stats=None):
+    """
+    Detects the document's application type from its title block and splits it
+    with that type's header matcher. lines may be a one-shot iterator.
+    Returns (app_type, sections).
+    """
+    lines = iter(lines)
+    head = list(islice(lines, DETECTION_LINES))
+    app_type = _detect_application_type("\n".join(head))
+    sections = split_sections(chain(head, lines), header_index.matcher(app_type), boilerplate, stats)
+    return app_type, sections
+
+def _parsing_failed(sections, parsed_sections):
+    """
+    True if no sections were found, or a section has content that neither
+    comment style could parse - the cases worth a debug file at the 'failures' level.
+    """
+    if not sections:
+        return True
+    return any(sections[key].strip() and not (parsed['strengths'] or parsed['concerns'])
+               for key, parsed in parsed_sections)
+
+def _timed_lines(lines, timing):
+    """Passes lines through, adding the time spent producing them to timing[0]."""
+    clock = time.perf_counter
+    lines = iter(lines)
+    while True:
+        start = clock()
+        line = next(lines, None)
+        timing[0] += clock() - start
+        if line is None:
+            return
+        yield line
+
+def process_evaluation_file(file_path, context):
+    """
+    Extracts, splits and parses a single evaluation file.
+    context holds the shared 'header_index', 'boilerplate', 'debug_level', 'cache',
+    'reader' and 'metrics' settings. Returns a compact, picklable result so it can
+    run inside a worker process. With metrics on, the result carries the file's
+    stage timings and counters under 'metrics'. When the debug level asks for it,
+    the cleaned text is returned under 'debug_text' for the caller to save, so
+    workers never write debug files themselves.
+    """
+    metrics = file_metrics(context['metrics'])
+    result = _process_evaluation_file(file_path, context, metrics)
+    if context['metrics']:
+        result['metrics'] = metrics.as_dict()
+    return result
+
+def _process_evaluation_file(file_path, context, metrics):
+    filename = os.path.basename(file_path)
+    result = {'filename': filename, 'status': 'ok', 'sections': []}
+
+    match = FILENAME_PATTERN.match(filename)
+    if not match:
+        result['status'] = 'bad_name'
+        return result
+
+    result['school'] = match.group(1).replace('_', ' ')
+    result['reviewer'] = match.group(3).replace('_', ' ')
+
+    header_index, boilerplate = context['header_index'], context['boilerplate']
+    stats = {} if context['metrics'] else None
+    if context['cache'] is None and context['reader'] == "stream":
+        # Nothing to store in a cache, so feed the splitter directly from the zip
+        # stream, keeping the lines only when a debug file may be written.
+        errors = []
+        all_lines = []
+        line_count = [0]
+        keep_lines = context['debug_level'] != "none"
+        def tee_lines():
+            for line in stream_cleaned_lines(file_path, errors):
+                line_count[0] += 1
+                if keep_lines:
+                    all_lines.append(line)
+                yield line
+        if stats is None:
+            result['app_type'], sections = split_document(tee_lines(), header_index, boilerplate)
+        else:
+            # Extraction and splitting are interleaved; time the line producer separately.
+            extract_time = [0.0]
+            result['app_type'], sections = split_document(_timed_lines(tee_lines(), extract_time),
+                                                          header_index, boilerplate, stats)
+            metrics.lap('split')
+            metrics.move_time('split', 'extract', extract_time[0])
+        if errors or not line_count[0]:
+            result['status'] = 'empty'
+            return result
+    else:
+        cache = context['cache']
+        hits = cache.hits if cache is not None else 0
+        cleaned_text, result['cache_record'] = extract_cleaned_text(file_path, cache, context['reader'])
+        metrics.lap('extract')
+        if cache is not None:
+            metrics.count('cache_hits', cache.hits - hits)
+        if not cleaned_text:
+            result['status'] = 'empty'
+            return result
+
+        # Get all cleaned lines from the document
+        all_lines = cleaned_text.splitlines()
+        line_count = [len(all_lines)]
+        result['app_type'], sections = split_document(all_lines, header_index, boilerplate, stats)
+        metrics.lap('split')
+
+    from section_parser import parse_section
+    for section_key, section_content in sections.items():
+        result['sections'].append((section_key, parse_section(section_content, result['reviewer'])))
+    metrics.lap('parse')
+
+    # Keep the fully cleaned text (before any filtering) for the debug output
+    debug_level = context['debug_level']
+    if debug_level == "all" or (debug_level == "failures" and _parsing_failed(sections, result['sections'])):
+        result['debug_file'] = os.path.splitext(filename)[0] + '.txt'
+        result['debug_text'] = "\n".join(all_lines)
+        metrics.lap('debug_text')
+
+    if stats is not None:
+        metrics.count('lines_scanned', line_count[0])
+        for name, n in stats.items():
+            metrics.count(name, n)
+        metrics.count('sections_found', len(sections))
+        for kind in COMMENT_KINDS:
+            metrics.count(kind, sum(len(parsed[kind]) for _, parsed in result['sections']))
+    return result
+
+# Per-process state for the worker pool, set once by _init_worker so the
+# header map, boilerplate set and cache index are not re-pickled for every file.
+_worker_state = {}
+
+def _init_worker(context):
+    _worker_state['context'] = context
+
+def _process_in_worker(file_path):
+    return process_evaluation_file(file_path, _worker_state['context'])
+
+def iter_file_results(evaluation_files, context, workers=1):
+    """
+    Yields per-file results in the order of evaluation_files.
+    With workers > 1 the files are processed in a process pool; results are
+    still yielded in input order so the merged report matches a serial run.
+    """
+    if workers <= 1 or len(evaluation_files) <= 1:
+        for file_path in evaluation_files:
+            yield process_evaluation_file(file_path, context)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(workers, len(evaluation_files))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(context,)) as executor:
+        chunksize = max(1, len(evaluation_files) // (workers * 4))
+        yield from executor.map(_process_in_worker, evaluation_files, chunksize=chunksize)
+
+def results_fingerprint(header_index, boilerplate):
+    """
+    Fingerprints everything besides the file itself that affects a per-file result,
+    so stored results are discarded when templates, headers or the parser change.
+    """
+    h = hashlib.sha256()
+    h.update(f"{EXTRACTOR_VERSION}\0{PARSER_VERSION}\0".encode('utf-8'))
+    h.update(f"h\0{header_index.fingerprint()}\0".encode('utf-8'))
+    h.update(f"b\0{boilerplate.fingerprint()}\0".encode('utf-8'))
+    return h.hexdigest()
+
+def collect_file_results(evaluation_files, context, workers=1, manifest=None, verbose=True, save_debug=None):
+    """
+    Returns per-file results in the order of evaluation_files. With a manifest,
+    unchanged files reuse their stored results and only new or changed files are
+    extracted and parsed; results for deleted files are dropped. Debug text is
+    handed to save_debug(name, text) as results arrive.
+
+    Stored results carry no text, so when a debug level is set every file is
+    processed again (its text still comes from the extraction cache) and gets
+    its debug file; the manifest is then only updated.
+    Returns (results, reused) where reused is the set of file paths taken from the manifest.
+    """
+    stored = {}
+    pending = evaluation_files
+    if manifest is not None:
+        dropped = manifest.prune(evaluation_files)
+        if dropped and verbose:
+            print(f"Dropped stored results for {dropped} removed files.")
+        reuse = context['debug_level'] == "none"
+        if not reuse and verbose:
+            print("Debug output is on, so stored results are not reused; every file is processed again.")
+        for file_path in evaluation_files:
+            result = manifest.lookup(file_path) if reuse else None
+            if result is not None:
+                stored[file_path] = result
+        pending = [p for p in evaluation_files if p not in stored]
+        if verbose:
+            print(f"Reusing stored results for {len(stored)} unchanged files; {len(pending)} files to process.")
+
+    if workers > 1 and len(pending) > 1:
+        print(f"Processing {len(pending)} files with {workers} worker processes.")
+    cache = context['cache']
+    fresh = {}
+    for file_path, result in zip(pending, iter_file_results(pending, context, workers)):
+        if cache is not None:
+            cache.record(result.get('cache_record'))
+        debug_text = result.pop('debug_text', None)
+        if debug_text is not None and save_debug is not None:
+            save_debug(result['debug_file'], debug_text)
+        if manifest is not None:
+            manifest.store(file_path, result)
+        fresh[file_path] = result
+
+    results = [stored[p] if p in stored else fresh[p] for p in evaluation_files]
+    return results, set(stored)
+
+def merge_file_result(aggregator, result, reused=False, verbose=True):
+    """Reduces one per-file result into the comment aggregator, printing its progress."""
+    filename = result['filename']
+    if verbose:
+        print(f"\nProcessing file: {filename}")
+
+    if result['status'] == 'bad_name':
+        print(f"Warning: Filename '{filename}' does not match expected pattern. Skipping.")
+        return
+
+    if verbose:
+        print(f"  School: {result['school']}, Reviewer: {result['reviewer']}")
+        if 'app_type' in result:
+            print(f"  Application type: {result['app_type']}")
+    if result['status'] != 'ok':
+        return
+
+    if verbose:
+        if reused:
+            print("  Unchanged since last run; using stored results.")
+        elif 'debug_file' in result:
+            print(f"  Saved cleaned text as debug file {result['debug_file']}")
+        print(f"  Found {len(result['sections'])} sections in the document.")
+
+    for section_key, parsed_comments in result['sections']:
+        if verbose and (parsed_comments['strengths'] or parsed_comments['concerns']):
+            print(f"    -> Parsed Section '{section_key}': {len(parsed_comments['strengths'])} strengths, {len(parsed_comments['concerns'])} concerns.")
+
+        if section_key not in aggregator:
+            # Get the full, pretty title for the report
+            aggregator.add_section(section_key, section_title(section_key))
+
+        for kind in COMMENT_KINDS:
+            for comment in parsed_comments[kind]:
+                aggregator.add_comment(section_key, kind, comment, result['school'])
+
+def _school_slug(school_name):
+    """
+    Returns a filesystem-safe name for a school's report and manifest. Names that
+    only contain word characters, '.', '-' and single spaces keep a readable slug
+    with spaces as '_'. Any other name would be lossy ("A&B" and "A B" both give
+    "A_B"), so a short hash of the full name is appended to keep schools apart.
+    """
+    slug = re.sub(r'[^\w.-]+', '_', school_name).strip('_') or 'school'
+    if slug.replace('_', ' ') != school_name:
+        slug += '-' + hashlib.sha256(school_name.encode('utf-8')).hexdigest()[:8]
+    return slug
+
+def school_of(file_path):
+    """Returns the school name encoded in an evaluation's filename, or None."""
+    match = FILENAME_PATTERN.match(os.path.basename(file_path))
+    if not match:
+        return None
+    return match.group(1).replace('_', ' ')
+
+def group_files_by_school(evaluation_files):
+    """
+    Groups evaluation files by the school name in their filename, preserving sorted
+    order within and across groups. Files that do not match the naming pattern are
+    reported and left out.
+    """
+    groups = {}
+    for file_path in evaluation_files:
+        school_name = school_of(file_path)
+        if school_name is None:
+            print(f"Warning: Filename '{os.path.basename(file_path)}' does not match expected pattern. Skipping.")
+            continue
+        groups.setdefault(school_name, []).append(file_path)
+    return groups
+
+def compile_school(school_name, school_files, context, options, save_debug=None):
+    """
+    Compiles one school's evaluations into its own report and returns a small summary.
+    The school's aggregate is written out and released before returning, so batch
+    runs only hold the schools currently being compiled in memory.
+
+    Debug text goes to save_debug(name, text) as each file is processed. Without
+    it (in a worker process) it is returned in the summary's 'debug_files' for
+    the parent, which owns the run's debug writer.
+    """
+    slug = _school_slug(school_name)
+    manifest = None
+    if options['manifest_dir']:
+        manifest = ResultManifest(os.path.join(options['manifest_dir'], slug + ".json"),
+                                  options['fingerprint'], rebuild=options['rebuild'])
+
+    debug_files = []
+    if save_debug is None:
+        save_debug = lambda name, text: debug_files.append((name, text))
+    results, reused = collect_file_results(school_files, context, manifest=manifest, verbose=False,
+                                           save_debug=save_debug)
+    aggregator = CommentAggregator(near_duplicates=options['near_duplicates'])
+    file_records = []
+    for file_path, result in zip(school_files, results):
+        duplicates = aggregator.duplicates
+        merge_file_result(aggregator, result, reused=file_path in reused, verbose=False)
+        if context['metrics']:
+            record = {k: result[k] for k in ('filename', 'status', 'school', 'metrics') if k in result}
+            file_records.append((record, file_path in reused, {'comments_deduped': aggregator.duplicates - duplicates}))
+    if manifest is not None:
+        manifest.save()
+
+    report_paths = generate_reports(aggregator.sections, os.path.join(options['school_dir'], slug),
+                                    options['canonical_order'], options['formats'], school=school_name)
+    # The index links the Markdown report when there is one.
+    report_path = next((p for p in report_paths if p.endswith(".md")), report_paths[0])
+
+    return {
+        'school': school_name,
+        'report': os.path.basename(report_path),
+        'reviewers': sum(1 for r in results if r['status'] == 'ok'),
+        'sections': len(aggregator.sections),
+        'strengths': sum(len(sec['strengths']) for sec in aggregator.sections.values()),
+        'concerns': sum(len(sec['concerns']) for sec in aggregator.sections.values()),
+        'cache_records': [r['cache_record'] for r in results if r.get('cache_record')],
+        'file_records': file_records,
+        'debug_files': debug_files,
+    }
+
+def _init_batch_worker(context, options):
+    _worker_state['context'] = context
+    _worker_state['options'] = options
+
+def _compile_school_in_worker(group):
+    school_name, school_files = group
+    return compile_school(school_name, school_files, _worker_state['context'], _worker_state['options'])
+
+def write_school_index(summaries, index_path):
+    """Writes a Markdown index linking every per-school report."""
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("# Charter Application Review Comments - School Index\n\n")
+        f.write("| School | Reviewers | Sections | Strengths | Concerns |\n")
+        f.write("|---|---|---|---|---|\n")
+        for summary in summaries:
+            f.write(f"| [{summary['school']}]({summary['report']}) | {summary['reviewers']} | "
+                    f"{summary['sections']} | {summary['strengths']} | {summary['concerns']} |\n")
+    os.replace(tmp_path, index_path)
+    print(f"\nSchool index generated at: {index_path}")
+
+def compile_batch(evaluation_files, context, workers, options, metrics=None, debug_writer=None):
+    """
+    Compiles each school's evaluations into a separate report, running schools
+    concurrently in a process pool, then writes an index of all school reports.
+    Per-file metrics gathered in the workers are added to metrics, and debug
+    text is saved through debug_writer, if given. Each school's summary is
+    handled as soon as that school finishes, so its debug text is handed to the
+    writer and released instead of being held until the whole batch is done.
+    """
+    groups = sorted(group_files_by_school(evaluation_files).items())
+    print(f"Compiling {len(groups)} schools from {len(evaluation_files)} files.")
+    os.makedirs(options['school_dir'], exist_ok=True)
+
+    cache = context['cache']
+    summaries = []
+
+    def finish(summary):
+        if cache is not None:
+            for record in summary['cache_records']:
+                cache.record(record)
+        if metrics is not None:
+            for file_record in summary['file_records']:
+                metrics.record_file(*file_record)
+        debug_files = summary.pop('debug_files')
+        if debug_writer is not None:
+            for name, text in debug_files:
+                debug_writer.write(name, text)
+        summaries.append(summary)
+        print(f"  {summary['school']}: {summary['reviewers']} reviewers, {summary['strengths']} strengths, "
+              f"{summary['concerns']} concerns -> {summary['report']}")
+
+    if workers <= 1 or len(groups) <= 1:
+        save_debug = debug_writer.write if debug_writer is not None else None
+        for school_name, school_files in groups:
+            finish(compile_school(school_name, school_files, context, options, save_debug))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups)), initializer=_init_batch_worker,
+                                 initargs=(context, options)) as executor:
+            futures = [executor.submit(_compile_school_in_worker, group) for group in groups]
+            for future in as_completed(futures):
+                finish(future.result())
+
+    summaries.sort(key=lambda summary: summary['school'])
+    write_school_index(summaries, os.path.join(options['school_dir'], "index.md"))
+
+def _remove_school_outputs(school_name, options):
+    """Deletes the report and stored results of a school whose evaluations were all removed."""
+    slug = _school_slug(school_name)
+    paths = [os.path.join(options['school_dir'], f"{slug}.{fmt}") for fmt in options['formats']]
+    if options['manifest_dir']:
+        paths.append(os.path.join(options['manifest_dir'], slug + ".json"))
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+async def watch_evaluations(input_dir, template_dir, context, options, reload_boilerplate,
+                            workers=1, poll_interval=1.0, debounce=2.0, debug_writer=None):
+    """
+    Long-running watch mode. Compiles every school once, then polls input_dir and
+    template_dir and, after each settled burst of changes, recompiles only the
+    schools whose evaluations were added, changed or removed, rewriting their
+    reports and the index atomically.
+
+    The header index, boilerplate index and extraction cache stay in memory
+    between events. With workers > 1 the affected schools are compiled
+    concurrently in a process pool. Polling pauses while a recompile runs; files
+    changed meanwhile differ from the last snapshot, so the next poll reports
+    them. A template change reloads the boilerplate index, which invalidates the
+    stored results, so every school is recompiled.
+
+    A school that fails to compile (an unreadable file, a file removed mid-run)
+    is reported and keeps its previous report and index entry; it is retried the
+    next time its evaluations change. Watching continues either way.
+    """
+    import asyncio
+    from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+    from folder_watcher import watch_folders
+
+    loop = asyncio.get_running_loop()
+    cache = context['cache']
+    summaries = {}
+
+    def start_executor():
+        if workers > 1:
+            return ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                       initargs=(context, options))
+        # One thread: the cache and manifests are only touched from one place at a time.
+        return ThreadPoolExecutor(max_workers=1)
+
+    def compile_in(executor, school_name, school_files):
+        if workers > 1:
+            return loop.run_in_executor(executor, _compile_school_in_worker, (school_name, school_files))
+        save_debug = debug_writer.write if debug_writer is not None else None
+        return loop.run_in_executor(executor, compile_school, school_name, school_files, context, options,
+                                    save_debug)
+
+    async def recompile(executor, school_names):
+        """Recompiles school_names; returns True if the executor broke and must be replaced."""
+        groups = group_files_by_school(list_evaluation_files(input_dir))
+        present = sorted(name for name in school_names if name in groups)
+        for school_name in sorted(set(school_names) - set(present)):
+            if summaries.pop(school_name, None) is not None:
+                _remove_school_outputs(school_name, options)
+                print(f"  {school_name}: no evaluations left; removed its report.")
+
+        results = await asyncio.gather(*(compile_in(executor, name, groups[name]) for name in present),
+                                       return_exceptions=True)
+        broken = False
+        for school_name, summary in zip(present, results):
+            if isinstance(summary, BaseException):
+                if not isinstance(summary, Exception):
+                    raise summary
+                broken = broken or isinstance(summary, BrokenExecutor)
+                kept = "keeping its previous report" if school_name in summaries else "no report written"
+                print(f"  Error compiling {school_name}: {type(summary).__name__}: {summary} ({kept}).")
+                continue
+            if cache is not None:
+                for record in summary['cache_records']:
+                    cache.record(record)
+            debug_files = summary.pop('debug_files')
+            if debug_writer is not None:
+                for name, text in debug_files:
+                    debug_writer.write(name, text)
+            summaries[summary['school']] = summary
+            print(f"  {summary['school']}: {summary['reviewers']} reviewers, {summary['strengths']} strengths, "
+                  f"{summary['concerns']} concerns -> {summary['report']}")
+
+        if cache is not None:
+            cache.save()
+        write_school_index([summaries[name] for name in sorted(summaries)],
+                           os.path.join(options['school_dir'], "index.md"))
+        return broken
+
+    async def recompile_and_recover(school_names):
+        nonlocal executor
+        if await recompile(executor, school_names):
+            print("  The worker pool stopped; starting a new one.")
+            executor.shutdown(wait=False)
+            executor = start_executor()
+
+    os.makedirs(options['school_dir'], exist_ok=True)
+    executor = start_executor()
+    try:
+        initial = group_files_by_school(list_evaluation_files(input_dir))
+        print(f"Compiling {len(initial)} schools, then watching '{input_dir}' and '{template_dir}' for changes.")
+        await recompile_and_recover(initial)
+
+        sources = {
+            'evaluations': functools.partial(list_evaluation_files, input_dir),
+            'templates': functools.partial(discover_template_files, template_dir),
+        }
+        async for changes in watch_folders(sources, poll_interval, debounce):
+            if 'templates' in changes:
+                print(f"\nTemplates changed ({len(changes['templates'])} files); reloading boilerplate.")
+                executor.shutdown(wait=True)
+                context['boilerplate'] = await loop.run_in_executor(None, reload_boilerplate)
+                options['fingerprint'] = results_fingerprint(context['header_index'], context['boilerplate'])
+                executor = start_executor()
+                affected = set(summaries) | set(group_files_by_school(list_evaluation_files(input_dir)))
+            else:
+                print(f"\nEvaluations changed: {', '.join(sorted(os.path.basename(p) for p in changes['evaluations']))}")
+                affected = {school_of(p) for p in changes['evaluations']} - {None}
+            await recompile_and_recover(affected)
+            print("Watching for changes...")
+    finally:
+        executor.shutdown(wait=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compiles reviewer comments from charter evaluation documents.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes for extraction and parsing (0 = one per CPU, default: 1).")
+    parser.add_argument("--reader", choices=READERS, default="stream",
+                        help="Document reader: 'stream' parses the .docx XML incrementally (default); "
+                             "'docx2txt' loads the whole document with docx2txt.")
+    parser.add_argument("--cache-dir", default=".cache",
+                        help="Directory for the extraction cache (default: .cache).")
+    parser.add_argument("--cache-max-mb", type=int, default=512,
+                        help="Maximum size of the extraction cache before LRU eviction (default: 512).")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--no-cache", action="store_true",
+                             help="Always re-extract and re-parse documents; do not read or write the cache or manifest.")
+    cache_group.add_argument("--rebuild-cache", action="store_true",
+                             help="Discard the existing cache and manifest and re-process every document.")
+    parser.add_argument("--exact-boilerplate", action="store_true",
+                        help="Only drop lines that match a template line exactly (ignoring case and spacing), "
+                             "not lightly edited or truncated template lines.")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="Also merge comments that differ only in case, whitespace or punctuation.")
+    parser.add_argument("--format", dest="formats", action="append", choices=REPORT_FORMATS,
+                        help="Report format; repeat for several (default: md). 'json' is one document, "
+                             "'jsonl' and 'csv' have one record per comment, 'docx' is a Word document.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Group evaluations by school and write one report per school plus an index "
+                             "to output/schools/.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: compile per-school reports like --batch, then recompile a school "
+                             "whenever its evaluations or the templates change.")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="Seconds between folder scans in --watch mode (default: 1.0).")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                        help="Seconds without further changes before --watch recompiles (default: 2.0).")
+    parser.add_argument("--debug", choices=DEBUG_LEVELS, default="none",
+                        help="Save the cleaned text of evaluations to debug/: 'failures' only for files with no "
+                             "sections or with sections neither comment style could parse, 'all' for every "
+                             "file (default: none). Stored results are not reused while this is on, so every "
+                             "evaluation is parsed again; extracted text still comes from the cache.")
+    parser.add_argument("--debug-archive", action="store_true",
+                        help="Write debug files into one compressed debug/debug-<timestamp>.zip per run.")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Write per-file and per-stage timings, counters and peak memory to PATH as JSON lines.")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Run under cProfile and save the stats to PATH (the main process only; "
+                             "combine with --workers 1 to profile extraction and parsing).")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Track Python allocations with tracemalloc and report the peak and largest sites.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function to orchestrate the compilation process.
     """
+    args = parse_args(argv)
+    # De-duplicated, in the order given.
+    args.formats = list(dict.fromkeys(args.formats or ["md"]))
+    metrics = RunMetrics(args.metrics)
+    with profiling(args.profile, args.trace_memory, metrics):
+        debug_writer = open_debug_writer("debug", args.debug, args.debug_archive)
+        try:
+            run(args, metrics, debug_writer)
+        finally:
+            if debug_writer is not None:
+                debug_writer.close()
+                target = debug_writer.archive_path or debug_writer.debug_dir
+                print(f"Saved {debug_writer.written} debug files to {target}.")
+    metrics.write()
+
+def run(args, metrics, debug_writer=None):
+    """Runs one compilation (or the watch loop) for parsed command-line arguments."""
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
     input_dir = "evaluations"
     template_dir = "templates"
     output_dir = "output"
-    debug_dir = "debug"
     
-    for d in [output_dir, debug_dir]:
-        if not os.path.exists(d):
-            os.makedirs(d)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
 
     print("--- Starting Charter Evaluation Compiler ---")
 
+    cache = None
+    if not args.no_cache:
+        with metrics.stage('load_cache'):
+            cache = ExtractionCache(os.path.join(args.cache_dir, "extraction"), EXTRACTOR_VERSION,
+                                    max_bytes=args.cache_max_mb * 1024 * 1024, rebuild=args.rebuild_cache)
+
     # 1. Load Templates & Build Header Map
-    boilerplate = load_templates(template_dir)
-    header_map = _build_header_map()
+    index_path = None if args.no_cache else os.path.join(args.cache_dir, "boilerplate.idx")
+    with metrics.stage('load_templates'):
+        boilerplate = load_boilerplate_index(template_dir, index_path, cache, args.reader,
+                                             fuzzy=not args.exact_boilerplate, rebuild=args.rebuild_cache)
+    reload_boilerplate = functools.partial(load_boilerplate_index, template_dir, index_path, cache,
+                                           args.reader, fuzzy=not args.exact_boilerplate)
+    with metrics.stage('build_header_index'):
+        header_index = build_header_index()
+    context = {
+        'header_index': header_index,
+        'boilerplate': boilerplate,
+        'debug_level': args.debug,
+        'cache': cache,
+        'reader': args.reader,
+        'metrics': metrics.enabled,
+    }
 
     # 2. Process Files
-    all_comments = {}
+    aggregator = CommentAggregator(near_duplicates=args.near_duplicates)
     
-    evaluation_files = glob.glob(os.path.join(input_dir, '*.docx'))
-    if not evaluation_files:
+    evaluation_files = list_evaluation_files(input_dir)
+    canonical_order = canonical_section_order()
+    if not evaluation_files and not args.watch:
         print(f"No .docx files found in '{input_dir}'. Exiting.")
         return
-        
-    canonical_order = list(basic_model_app().keys())
 
-    for file_path in evaluation_files:
-        print(f"\nProcessing file: {os.path.basename(file_path)}")
-        
-        filename = os.path.basename(file_path)
-        match = re.match(r'(.+)_Ev(al|anl)_(.+)\.docx', filename, re.IGNORECASE)
-        if not match:
-            print(f"Warning: Filename '{filename}' does not match expected pattern. Skipping.")
-            continue
-        
-        school_name = match.group(1).replace('_', ' ')
-        reviewer_name = match.group(3).replace('_', ' ')
-        
-        print(f"  School: {school_name}, Reviewer: {reviewer_name}")
-
-        raw_text = extract_text_from_docx(file_path)
-        if not raw_text:
-            continue
-        
-        # Get all cleaned lines from the document
-        all_lines = clean_text(raw_text).splitlines()
-        
-        # Save the fully cleaned text (before any filtering) to debug
-        debug_filename = os.path.splitext(filename)[0] + '.txt'
-        with open(os.path.join(debug_dir, debug_filename), 'w', encoding='utf-8') as f:
-            f.write("\n".join(all_lines))
-        print(f"  Saved cleaned text to debug/{debug_filename}")
-
-        # New, more robust section splitting logic
-        sections = {}
-        current_section_key = None
-        current_content = []
-
-        for line in all_lines:
-            # Check if the line is a header FIRST
-            if line in header_map:
-                # If we were in a section, save its content
-                if current_section_key:
-                    sections[current_section_key] = "\n".join(current_content)
-                
-                # Start the new section
-                current_section_key = header_map[line]
-                current_content = [] # Reset content for the new section
-            
-            # If it's not a header, check if it's NOT boilerplate, then add it
-            elif current_section_key and line not in boilerplate:
-                current_content.append(line)
-        
-        # Save the very last section's content after the loop finishes
-        if current_section_key:
-            sections[current_section_key] = "\n".join(current_content)
-
-        print(f"  Found {len(sections)} sections in the document.")
-
-        for section_key, section_content in sections.items():
-            parsed_comments = parse_section(section_content, reviewer_name)
-            
-            if parsed_comments['strengths'] or parsed_comments['concerns']:
-                print(f"    -> Parsed Section '{section_key}': {len(parsed_comments['strengths'])} strengths, {len(parsed_comments['concerns'])} concerns.")
-            
-            if section_key not in all_comments:
-                # Get the full, pretty title for the report
-                full_title = "Unknown Section"
-                for app_type in [basic_model_app, virtual_model_app, high_performing_app]:
-                    if section_key in app_type():
-                        full_title = app_type()[section_key][0]
-                        break
-                all_comments[section_key] = {'title': full_title, 'strengths': [], 'concerns': []}
-
-            for s_comment in parsed_comments['strengths']:
-                if s_comment['comment'] not in [c['comment'] for c in all_comments[section_key]['strengths']]:
-                    all_comments[section_key]['strengths'].append(s_comment)
-            
-            for c_comment in parsed_comments['concerns']:
-                if c_comment['comment'] not in [c['comment'] for c in all_comments[section_key]['concerns']]:
-                    all_comments[section_key]['concerns'].append(c_comment)
+    if args.batch or args.watch:
+        options = {
+            'school_dir': os.path.join(output_dir, "schools"),
+            'manifest_dir': None if args.no_cache else os.path.join(args.cache_dir, "manifests"),
+            'fingerprint': results_fingerprint(header_index, boilerplate),
+            'rebuild': args.rebuild_cache,
+            'near_duplicates': args.near_duplicates,
+            'canonical_order': canonical_order,
+            'formats': args.formats,
+        }
+        if args.watch:
+            os.makedirs(input_dir, exist_ok=True)
+            import asyncio
+            try:
+                asyncio.run(watch_evaluations(input_dir, template_dir, context, options, reload_boilerplate,
+                                              workers, args.poll_interval, args.debounce, debug_writer))
+            except KeyboardInterrupt:
+                print("\nStopped watching.")
+            if cache is not None:
+                cache.save()
+            return
+        with metrics.stage('compile_schools'):
+            compile_batch(evaluation_files, context, workers, options, metrics, debug_writer)
+        if cache is not None:
+            with metrics.stage('save_cache'):
+                cache.save()
+        print("\n--- Script processing complete. ---")
+        return
+
+    manifest = None
+    if not args.no_cache:
+        manifest = ResultManifest(os.path.join(args.cache_dir, "manifest.json"),
+                                  results_fingerprint(header_index, boilerplate), rebuild=args.rebuild_cache)
+
+    with metrics.stage('process_files'):
+        results, reused = collect_file_results(evaluation_files, context, workers, manifest,
+                                               save_debug=debug_writer.write if debug_writer else None)
+    with metrics.stage('merge'):
+        for file_path, result in zip(evaluation_files, results):
+            duplicates = aggregator.duplicates
+            merge_file_result(aggregator, result, reused=file_path in reused)
+            metrics.record_file(result, file_path in reused, {'comments_deduped': aggregator.duplicates - duplicates})
+    print(f"\nSkipped {aggregator.duplicates} duplicate comments across reviewers.")
+
+    with metrics.stage('save_cache'):
+        if cache is not None:
+            cache.save()
+        if manifest is not None:
+            manifest.save()
 
     # 3. Generate Report
-    report_path = os.path.join(output_dir, "charter_evaluation_compilation.md")
-    generate_markdown_report(all_comments, report_path, canonical_order)
+    with metrics.stage('report'):
+        generate_reports(aggregator.sections, os.path.join(output_dir, "charter_evaluation_compilation"),
+                         canonical_order, args.formats)
     
     print("\n--- Script processing complete. ---")
 
@@ -0,0 +1,73 @@
+import re
+import unicodedata
+
+from comment_store import CommentStore
+
+COMMENT_KINDS = ('strengths', 'concerns')
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def exact_key(comment_text):
+    """Dedup key for exact mode: the comment text itself."""
+    return comment_text
+
+
+def near_duplicate_key(comment_text):
+    """
+    Dedup key for near-duplicate mode: case-folded, punctuation-free text with
+    whitespace collapsed, so comments that differ only in those respects match.
+    """
+    text = unicodedata.normalize('NFKC', comment_text).casefold()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+class CommentAggregator:
+    """
+    Accumulates de-duplicated comments per section and kind across reviewers.
+
+    Comments are kept in a compact CommentStore. Each (section, kind) pair maps
+    the hash of every dedup key seen to the row of the comment that produced it,
+    so a duplicate check is one dict lookup without holding a second copy of
+    every comment. On a hash hit the stored comment's key is compared, so two
+    different comments whose hashes collide are both kept. The first reviewer to
+    make a comment keeps the attribution. `sections` has the same shape the
+    report generator expects: {section_key: {'title', 'strengths', 'concerns'}},
+    with each comment list ordered by reviewer.
+    """
+
+    def __init__(self, near_duplicates=False):
+        self.key_func = near_duplicate_key if near_duplicates else exact_key
+        self.store = CommentStore(COMMENT_KINDS)
+        self.sections = self.store.sections
+        self._seen = {}  # (section_key, kind) -> {hash of dedup key: row, or tuple of rows on a collision}
+        self.duplicates = 0
+
+    def __contains__(self, section_key):
+        return section_key in self.store.titles
+
+    def add_section(self, section_key, title):
+        """Registers a section with its report title if it is not already present."""
+        if section_key not in self.store.titles:
+            self.store.add_section(section_key, title)
+            for kind in COMMENT_KINDS:
+                self._seen[section_key, kind] = {}
+
+    def add_comment(self, section_key, kind, entry, school=None):
+        """
+        Adds a {'reviewer', 'comment'} entry unless an equivalent comment is already
+        in the section. Returns True if the entry was added.
+        """
+        seen = self._seen[section_key, kind]
+        key = self.key_func(entry['comment'])
+        key_hash = hash(key)
+        rows = seen.get(key_hash)
+        if rows is not None:
+            if isinstance(rows, int):
+                rows = (rows,)
+            if any(self.key_func(self.store.text(row)) == key for row in rows):
+                self.duplicates += 1
+                return False
+        row = self.store.add(section_key, kind, entry['reviewer'], entry['comment'], school)
+        seen[key_hash] = row if rows is None else rows + (row,)
+        return True
@@ -0,0 +1,257 @@
+from array import array
+from collections.abc import Mapping
+from itertools import chain, compress
+
+
+class StringTable:
+    """Interns repeated strings (reviewers, schools, section keys) as small integer ids."""
+
+    __slots__ = ('names', '_ids')
+
+    def __init__(self):
+        self.names = []
+        self._ids = {}
+
+    def intern(self, name):
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def id_of(self, name):
+        """The id of name, or None if it was never interned."""
+        return self._ids.get(name)
+
+    def __len__(self):
+        return len(self.names)
+
+
+class CommentRecord:
+    """
+    A lightweight view of one stored comment. Supports entry['reviewer'] and
+    entry['comment'] like the {'reviewer', 'comment'} dicts parse_section returns,
+    plus 'school', 'section' and 'kind'.
+    """
+
+    __slots__ = ('_store', 'index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self.index = index
+
+    def __getitem__(self, field):
+        return self._store.field(self.index, field)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def as_dict(self):
+        return {field: self[field] for field in CommentStore.FIELDS}
+
+    def __repr__(self):
+        return f"CommentRecord({self.as_dict()!r})"
+
+
+class CommentList:
+    """Read-only sequence view of stored comments, in the order given by indices."""
+
+    __slots__ = ('_store', '_indices')
+
+    def __init__(self, store, indices):
+        self._store = store
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, position):
+        return CommentRecord(self._store, self._indices[position])
+
+    def __iter__(self):
+        store = self._store
+        return (CommentRecord(store, index) for index in self._indices)
+
+
+class SectionView(Mapping):
+    """One section as the report writers expect it: {'title', 'strengths', 'concerns'}."""
+
+    __slots__ = ('_store', 'key')
+
+    def __init__(self, store, key):
+        self._store = store
+        self.key = key
+
+    def __getitem__(self, name):
+        store = self._store
+        if name == 'title':
+            return store.titles[self.key]
+        if name not in store.kinds:
+            raise KeyError(name)
+        return CommentList(store, store.ordered(self.key, name))
+
+    def __iter__(self):
+        yield 'title'
+        yield from self._store.kinds
+
+    def __len__(self):
+        return 1 + len(self._store.kinds)
+
+
+class SectionsView(Mapping):
+    """{section_key: SectionView} over a CommentStore, in the order sections were added."""
+
+    __slots__ = ('_store',)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, key):
+        if key not in self._store.titles:
+            raise KeyError(key)
+        return SectionView(self._store, key)
+
+    def __contains__(self, key):
+        return key in self._store.titles
+
+    def __iter__(self):
+        return iter(self._store.titles)
+
+    def __len__(self):
+        return len(self._store.titles)
+
+
+class CommentStore:
+    """
+    Columnar store of aggregated comments.
+
+    Each comment is a row across parallel arrays of interned reviewer, school,
+    section and kind ids. Its text is kept once, UTF-8 encoded in one shared
+    buffer and addressed by offsets, so no per-comment dict or string object is
+    held. For each (section, kind) the row indices are bucketed by reviewer as
+    comments are added; reading a comment list sorts only the distinct reviewer
+    names and concatenates their buckets, so comments are never sorted.
+
+    `sections` is a read-only mapping with the same shape as the old dict of
+    dicts: sections[key]['title'], and sections[key]['strengths'] /
+    ['concerns'] iterate records that support entry['reviewer'] and
+    entry['comment']. comments() answers filtered queries such as all Budget
+    concerns across schools, or everything one reviewer wrote.
+    """
+
+    FIELDS = ('school', 'section', 'kind', 'reviewer', 'comment')
+
+    def __init__(self, kinds):
+        self.kinds = tuple(kinds)
+        self._kind_ids = {kind: kind_id for kind_id, kind in enumerate(self.kinds)}
+        self.reviewers = StringTable()
+        self.schools = StringTable()
+        self.section_keys = StringTable()
+        self.titles = {}  # section key -> report title, in insertion order
+        self.reviewer_ids = array('I')
+        self.school_ids = array('I')
+        self.section_ids = array('I')
+        self.kind_ids = array('B')
+        self._text = bytearray()
+        self._offsets = array('Q', [0])
+        self._buckets = {}  # (section key, kind) -> {reviewer: array of row indices}
+        self._ordered = {}  # (section key, kind) -> row indices in reviewer order, until the next add
+        self.sections = SectionsView(self)
+
+    def __len__(self):
+        return len(self.reviewer_ids)
+
+    def add_section(self, section_key, title):
+        if section_key not in self.titles:
+            self.titles[section_key] = title
+            self.section_keys.intern(section_key)
+
+    def add(self, section_key, kind, reviewer, comment, school=None):
+        """Appends a comment to a section added with add_section and returns its row index."""
+        index = len(self.reviewer_ids)
+        reviewer_id = self.reviewers.intern(reviewer)
+        self.reviewer_ids.append(reviewer_id)
+        self.school_ids.append(self.schools.intern(school))
+        self.section_ids.append(self.section_keys.intern(section_key))
+        self.kind_ids.append(self._kind_ids[kind])
+        self._text += comment.encode('utf-8')
+        self._offsets.append(len(self._text))
+
+        buckets = self._buckets.get((section_key, kind))
+        if buckets is None:
+            buckets = self._buckets[section_key, kind] = {}
+        bucket = buckets.get(reviewer)
+        if bucket is None:
+            bucket = buckets[self.reviewers.names[reviewer_id]] = array('I')
+        bucket.append(index)
+        self._ordered.pop((section_key, kind), None)
+        return index
+
+    def ordered(self, section_key, kind):
+        """
+        Row indices of a (section, kind) ordered by reviewer name, each reviewer's
+        comments in insertion order. Built from the buckets on first use after a change.
+        """
+        indices = self._ordered.get((section_key, kind))
+        if indices is None:
+            buckets = self._buckets.get((section_key, kind))
+            if not buckets:
+                return ()
+            indices = array('I')
+            for reviewer in sorted(buckets):
+                indices.extend(buckets[reviewer])
+            self._ordered[section_key, kind] = indices
+        return indices
+
+    def text(self, index):
+        return self._text[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def field(self, index, field):
+        if field == 'comment':
+            return self.text(index)
+        if field == 'reviewer':
+            return self.reviewers.names[self.reviewer_ids[index]]
+        if field == 'school':
+            return self.schools.names[self.school_ids[index]]
+        if field == 'section':
+            return self.section_keys.names[self.section_ids[index]]
+        if field == 'kind':
+            return self.kinds[self.kind_ids[index]]
+        raise KeyError(field)
+
+    def comments(self, section=None, kind=None, reviewer=None, school=None):
+        """
+        Yields the records matching every given filter, in insertion order;
+        e.g. comments(section='20-Budget', kind='concerns'). A section filter uses
+        the per-section index; other filters scan their id column.
+        """
+        if kind is not None and kind not in self._kind_ids:
+            return
+        filters = []
+        for value, table, column in ((reviewer, self.reviewers, self.reviewer_ids),
+                                     (school, self.schools, self.school_ids)):
+            if value is not None:
+                value_id = table.id_of(value)
+                if value_id is None:
+                    return
+                filters.append((column, value_id))
+
+        if section is not None:
+            kinds = self.kinds if kind is None else (kind,)
+            candidates = sorted(chain.from_iterable(
+                chain.from_iterable(self._buckets.get((section, k), {}).values()) for k in kinds))
+        elif kind is not None:
+            candidates = compress(range(len(self)), map(self._kind_ids[kind].__eq__, self.kind_ids))
+        elif filters:
+            column, value_id = filters.pop()
+            candidates = compress(range(len(self)), map(value_id.__eq__, column))
+        else:
+            candidates = range(len(self))
+
+        for column, value_id in filters:
+            candidates = [index for index in candidates if column[index] == value_id]
+        for index in candidates:
+            yield CommentRecord(self, index)
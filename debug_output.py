@@ -0,0 +1,83 @@
+import os
+import queue
+import threading
+import time
+
+DEBUG_LEVELS = ("none", "failures", "all")
+
+
+class DebugWriter:
+    """
+    Writes debug text files from a background thread, so saving them never
+    blocks extraction or parsing.
+
+    Files go into debug_dir, or with archive=True into a single compressed
+    debug-<timestamp>.zip in debug_dir for the whole run. Call close() (or use
+    it as a context manager) to wait for pending writes to finish.
+    """
+
+    def __init__(self, debug_dir, archive=False):
+        os.makedirs(debug_dir, exist_ok=True)
+        self.debug_dir = debug_dir
+        self.archive_path = None
+        self._archive = None
+        if archive:
+            import zipfile
+            self.archive_path = os.path.join(debug_dir, time.strftime("debug-%Y%m%d-%H%M%S.zip"))
+            self._archive = zipfile.ZipFile(self.archive_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.written = 0
+        self.errors = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="debug-writer", daemon=True)
+        self._thread.start()
+
+    def location(self, name):
+        """Where a debug file with this name ends up, for progress messages."""
+        if self.archive_path:
+            return f"{self.archive_path}:{name}"
+        return os.path.join(self.debug_dir, name)
+
+    def write(self, name, text):
+        """Queues text to be saved as name; returns immediately."""
+        self._queue.put((name, text))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            name, text = item
+            try:
+                if self._archive is not None:
+                    self._archive.writestr(name, text)
+                else:
+                    with open(os.path.join(self.debug_dir, name), 'w', encoding='utf-8') as f:
+                        f.write(text)
+                self.written += 1
+            except OSError as e:
+                self.errors.append((name, e))
+
+    def close(self):
+        """Flushes pending writes and closes the archive. Safe to call more than once."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        for name, error in self.errors:
+            print(f"Error writing debug file {name}: {error}")
+        self.errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_debug_writer(debug_dir, level, archive=False):
+    """Returns a DebugWriter for the given level, or None when debug output is off."""
+    if level == "none":
+        return None
+    return DebugWriter(debug_dir, archive)
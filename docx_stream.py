@@ -0,0 +1,98 @@
+import re
+import zipfile
+import zlib
+from xml.etree.ElementTree import ParseError, iterparse
+
+from text_cleaning import clean_line
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BREAKS = (W_NS + 'br', W_NS + 'cr')
+
+# Same part selection and order as docx2txt: headers, the body, then footers.
+_HEADER_PART = re.compile(r'word/header[0-9]*.xml')
+_FOOTER_PART = re.compile(r'word/footer[0-9]*.xml')
+_BODY_PART = 'word/document.xml'
+
+# Everything reading a damaged or non-.docx file can raise: a bad zip directory,
+# missing parts, truncated or corrupt deflate data, undecodable or malformed XML,
+# and compression methods zipfile does not support.
+READ_ERRORS = (OSError, KeyError, EOFError, UnicodeDecodeError, NotImplementedError,
+               zlib.error, zipfile.BadZipFile, ParseError)
+
+
+def _iter_part_fragments(part):
+    """
+    Incrementally parses one WordprocessingML part and yields text fragments in
+    document order, using docx2txt's conventions: each paragraph start is a blank
+    line ("\\n\\n"), <w:br>/<w:cr> is a newline and <w:tab> is a tab.
+
+    Text inside content controls, text boxes and form-field results is ordinary
+    <w:t> content, so it is picked up wherever it appears. Finished top-level
+    elements are cleared as parsing advances, so only the current block is ever
+    held in memory.
+    """
+    depth = 0
+    body = None
+    for event, elem in iterparse(part, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if depth == 2:
+                body = elem
+            if elem.tag == W_P:
+                yield '\n\n'
+            continue
+
+        depth -= 1
+        tag = elem.tag
+        if tag == W_T:
+            if elem.text:
+                yield elem.text
+        elif tag == W_TAB:
+            yield '\t'
+        elif tag in W_BREAKS:
+            yield '\n'
+        if depth == 2 and body is not None:
+            body.clear()
+
+
+def _iter_raw_lines(docx_path):
+    """Yields the raw lines of a .docx, as str.splitlines() would split docx2txt's text."""
+    buffer = []
+    with zipfile.ZipFile(docx_path) as zipf:
+        names = zipf.namelist()
+        parts = [n for n in names if _HEADER_PART.match(n)]
+        parts.append(_BODY_PART)
+        parts.extend(n for n in names if _FOOTER_PART.match(n))
+
+        # Fragments from consecutive parts are concatenated, exactly like docx2txt.
+        for name in parts:
+            with zipf.open(name) as part:
+                for fragment in _iter_part_fragments(part):
+                    if '\n' not in fragment:
+                        buffer.append(fragment)
+                        continue
+                    head, *rest = fragment.split('\n')
+                    buffer.append(head)
+                    # Appending '\n' keeps str.splitlines() semantics for trailing
+                    # Unicode line separators inside a line.
+                    yield from (''.join(buffer) + '\n').splitlines()
+                    for line in rest[:-1]:
+                        yield from (line + '\n').splitlines()
+                    buffer = [rest[-1]]
+    if buffer:
+        yield from ''.join(buffer).splitlines()
+
+
+def iter_docx_lines(docx_path):
+    """
+    Streams the cleaned, non-blank lines of a .docx file without materializing
+    the document. The result is identical to clean_lines(docx2txt.process(path)).
+    Raises one of READ_ERRORS for files that are not readable .docx documents.
+    """
+    for raw_line in _iter_raw_lines(docx_path):
+        line = clean_line(raw_line)
+        if line:
+            yield line
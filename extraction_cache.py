@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_FILENAME = "index.json"
+
+
+def file_digest(file_path):
+    """Returns the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write_text(path, text):
+    """Writes text to path via a temporary file so readers never see a partial entry."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class ExtractionCache:
+    """
+    On-disk, content-addressed cache of cleaned document text.
+
+    Entries are keyed by the SHA-256 of the source file plus its size and the
+    extractor version, so renaming or touching a file never re-extracts it, while
+    any content change or extractor upgrade does. A per-path (size, mtime) index
+    lets unchanged files skip hashing entirely. The cache is bounded in size and
+    evicts least-recently-used entries when saved.
+
+    Worker processes can use a pickled copy of the cache for lookups and stores;
+    they return the record from get() so the parent can fold it in with record()
+    before calling save(). Only the parent process should call save().
+    """
+
+    def __init__(self, cache_dir, version, max_bytes=DEFAULT_MAX_BYTES, rebuild=False):
+        self.cache_dir = cache_dir
+        self.text_dir = os.path.join(cache_dir, "text")
+        self.version = version
+        self.max_bytes = max_bytes
+        self.files = {}    # abs path -> [size, mtime_ns, content digest]
+        self.entries = {}  # entry key -> [nbytes, last_used]
+        self.hits = 0
+        self.misses = 0
+
+        if rebuild and os.path.isdir(self.text_dir):
+            shutil.rmtree(self.text_dir)
+        os.makedirs(self.text_dir, exist_ok=True)
+        if not rebuild:
+            self._load_index()
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.files = index.get('files', {})
+        self.entries = index.get('entries', {})
+
+    def _entry_path(self, key):
+        return os.path.join(self.text_dir, key[:2], key + ".txt")
+
+    def _entry_key(self, digest, size):
+        return hashlib.sha256(f"{self.version}\0{size}\0{digest}".encode('utf-8')).hexdigest()
+
+    def get(self, file_path, produce):
+        """
+        Returns (text, record) for file_path, calling produce(file_path) on a miss.
+        produce must return the cleaned text, or None on failure (which is not cached).
+        """
+        abs_path = os.path.abspath(file_path)
+        st = os.stat(abs_path)
+        known = self.files.get(abs_path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            digest = known[2]
+        else:
+            digest = file_digest(abs_path)
+
+        key = self._entry_key(digest, st.st_size)
+        entry_path = self._entry_path(key)
+        text = None
+        if key in self.entries or os.path.exists(entry_path):
+            try:
+                with open(entry_path, 'r', encoding='utf-8', newline='') as f:
+                    text = f.read()
+            except OSError:
+                text = None
+
+        if text is None:
+            self.misses += 1
+            text = produce(file_path)
+            if text is None:
+                return None, None
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            _atomic_write_text(entry_path, text)
+        else:
+            self.hits += 1
+
+        record = (abs_path, st.st_size, st.st_mtime_ns, digest, key, len(text.encode('utf-8')))
+        self.record(record)
+        return text, record
+
+    def record(self, record):
+        """Folds a record returned by get() (possibly in another process) into the index."""
+        if not record:
+            return
+        abs_path, size, mtime_ns, digest, key, nbytes = record
+        self.files[abs_path] = [size, mtime_ns, digest]
+        self.entries[key] = [nbytes, time.time()]
+
+    def save(self):
+        """Evicts least-recently-used entries beyond max_bytes and writes the index."""
+        total = sum(nbytes for nbytes, _ in self.entries.values())
+        if total > self.max_bytes:
+            for key, (nbytes, _) in sorted(self.entries.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+                del self.entries[key]
+                total -= nbytes
+
+        self.files = {
+            path: info for path, info in self.files.items()
+            if self._entry_key(info[2], info[0]) in self.entries
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _atomic_write_text(self._index_path(), json.dumps({'files': self.files, 'entries': self.entries}))
@@ -1,5 +1,67 @@
+import argparse
+import json
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import docx2txt
+from extraction_cache import file_digest
+
+MANIFEST_FILENAME = ".convert_manifest.json"
+
+def find_office_converter():
+    """Returns the path of a LibreOffice (soffice) executable on PATH, or None."""
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+def convert_legacy_doc(input_path, output_dir, converter=None, timeout=180):
+    """
+    Converts a legacy binary .doc file to .docx with LibreOffice in headless mode.
+    Each call uses its own LibreOffice profile inside output_dir so conversions can
+    run in parallel. Returns the path of the new .docx, or None if conversion failed.
+    """
+    converter = converter or find_office_converter()
+    if not converter:
+        print(f"Error: Cannot convert {input_path}: LibreOffice (soffice) was not found on PATH.")
+        return None
+
+    profile_dir = os.path.abspath(os.path.join(output_dir, ".lo_profile"))
+    command = [
+        converter, "--headless", "--norestore",
+        f"-env:UserInstallation=file://{profile_dir}",
+        "--convert-to", "docx", "--outdir", output_dir, input_path,
+    ]
+    try:
+        subprocess.run(command, check=True, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error converting {input_path} with LibreOffice: {e}")
+        return None
+
+    output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + ".docx")
+    if not os.path.exists(output_path):
+        print(f"Error converting {input_path}: LibreOffice did not produce {output_path}")
+        return None
+    return output_path
+
+def extract_document_text(input_path):
+    """
+    Returns the raw text of a .docx, or of a legacy .doc after converting it with
+    LibreOffice. Raises on failure.
+    """
+    if not input_path.lower().endswith(".doc"):
+        return docx2txt.process(input_path)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        docx_path = convert_legacy_doc(input_path, tmp_dir)
+        if not docx_path:
+            raise RuntimeError("LibreOffice conversion failed")
+        return docx2txt.process(docx_path)
 
 def convert_single_document(input_path=None, output_path=None):
     """
@@ -18,7 +80,7 @@ def convert_single_document(input_path=None, output_path=None):
         output_path = base_name + "_converted.txt"
 
     try:
-        text = docx2txt.process(input_path)
+        text = extract_document_text(input_path)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(text)
         
@@ -27,44 +89,180 @@ def convert_single_document(input_path=None, output_path=None):
     except Exception as e:
         print(f"An error occurred: {e}")
 
-def convert_folder(folder_path):
+def _convert_task(input_path, output_path):
+    """
+    Converts one document for the batch converter, in a worker. Returns
+    (input_path, output_path, error) where error is None on success.
     """
-    Converts all Word documents in a folder to plain text files.
+    try:
+        text = extract_document_text(input_path)
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, output_path)
+        return input_path, output_path, None
+    except Exception as e:
+        return input_path, output_path, f"{type(e).__name__}: {e}"
+
+def find_documents(folder_path):
+    """Returns every .doc/.docx under folder_path, recursively and sorted, skipping Word lock files."""
+    documents = []
+    for root, dirs, files in os.walk(folder_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for filename in sorted(files):
+            if filename.lower().endswith((".doc", ".docx")) and not filename.startswith("~$"):
+                documents.append(os.path.join(root, filename))
+    return documents
+
+def output_path_for(input_path, folder_path, output_dir=None):
+    """<name>_converted.txt next to the input, or at the same relative path under output_dir."""
+    base_name, _ = os.path.splitext(input_path)
+    if output_dir:
+        base_name = os.path.join(output_dir, os.path.relpath(base_name, folder_path))
+    return base_name + "_converted.txt"
+
+class ConversionManifest:
+    """
+    Remembers the size, mtime and SHA-256 of each converted input, so unchanged
+    documents are skipped. A document whose mtime changed but whose content did
+    not (copied or touched) is also skipped after hashing. Without an entry, an
+    output newer than its input counts as up to date.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_current(self, input_path, output_path):
+        if not os.path.exists(output_path):
+            return False
+        st = os.stat(input_path)
+        entry = self.entries.get(os.path.abspath(input_path))
+        if entry is None:
+            return os.stat(output_path).st_mtime_ns >= st.st_mtime_ns
+        if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return True
+        if entry['size'] == st.st_size and entry['sha256'] == file_digest(input_path):
+            self.record(input_path)
+            return True
+        return False
+
+    def record(self, input_path):
+        st = os.stat(input_path)
+        self.entries[os.path.abspath(input_path)] = {
+            'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': file_digest(input_path)
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+def convert_folder(folder_path, output_dir=None, workers=None, office_workers=2, force=False):
+    """
+    Converts all Word documents under a folder (recursively) to plain text files.
+
+    .docx files are converted in a process pool of `workers` processes. Legacy
+    .doc files go through LibreOffice, at most `office_workers` at a time, since
+    each conversion starts its own office process. Documents whose output is
+    up to date are skipped unless force is set. Ends with a summary of converted,
+    skipped and failed files and the throughput. Returns the summary as a dict.
     """
     if not os.path.isdir(folder_path):
         print(f"Error: Folder not found at {folder_path}")
-        return
+        return None
+
+    start = time.perf_counter()
+    manifest = ConversionManifest(os.path.join(output_dir or folder_path, MANIFEST_FILENAME))
+    pending, skipped = [], []
+    for input_path in find_documents(folder_path):
+        output_path = output_path_for(input_path, folder_path, output_dir)
+        if not force and manifest.is_current(input_path, output_path):
+            skipped.append(input_path)
+        else:
+            pending.append((input_path, output_path))
+
+    legacy = [task for task in pending if task[0].lower().endswith(".doc")]
+    modern = [task for task in pending if not task[0].lower().endswith(".doc")]
+    if legacy and not find_office_converter():
+        print(f"Warning: LibreOffice (soffice) was not found on PATH; {len(legacy)} .doc files cannot be converted.")
+    print(f"Converting {len(pending)} documents ({len(legacy)} legacy .doc); {len(skipped)} already up to date.")
+
+    converted, failed = [], []
+    converted_bytes = 0
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as docx_pool, \
+            ThreadPoolExecutor(max_workers=max(1, office_workers)) as office_pool:
+        futures = [docx_pool.submit(_convert_task, *task) for task in modern]
+        futures += [office_pool.submit(_convert_task, *task) for task in legacy]
+        for future in as_completed(futures):
+            input_path, output_path, error = future.result()
+            if error:
+                failed.append((input_path, error))
+                print(f"  Failed: {input_path}: {error}")
+                continue
+            manifest.record(input_path)
+            converted.append(input_path)
+            converted_bytes += os.path.getsize(input_path)
+            print(f"  Converted {input_path} -> {output_path}")
+    manifest.save()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'converted': len(converted), 'skipped': len(skipped), 'failed': len(failed),
+        'seconds': elapsed,
+        'files_per_second': len(converted) / elapsed if elapsed else 0.0,
+        'mib_per_second': converted_bytes / elapsed / (1024 * 1024) if elapsed else 0.0,
+    }
+    print(f"\nConverted {summary['converted']}, skipped {summary['skipped']} up to date, "
+          f"failed {summary['failed']} in {elapsed:.2f}s "
+          f"({summary['files_per_second']:.1f} files/s, {summary['mib_per_second']:.2f} MiB/s).")
+    for input_path, error in failed:
+        print(f"  {input_path}: {error}")
+    return summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Converts Word documents (.docx, and .doc via LibreOffice) to plain text.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    file_parser = commands.add_parser("convert-file", help="Convert one document.")
+    file_parser.add_argument("input_path")
+    file_parser.add_argument("output_path", nargs="?")
+
+    folder_parser = commands.add_parser("convert-folder", help="Convert every document under a folder, recursively.")
+    folder_parser.add_argument("folder_path")
+    folder_parser.add_argument("--output-dir",
+                               help="Write outputs under this directory, mirroring the folder tree "
+                                    "(default: next to each document).")
+    folder_parser.add_argument("--workers", type=int, default=0,
+                               help="Processes for .docx conversion (default: one per CPU).")
+    folder_parser.add_argument("--office-workers", type=int, default=2,
+                               help="Concurrent LibreOffice conversions for legacy .doc files (default: 2).")
+    folder_parser.add_argument("--force", action="store_true",
+                               help="Convert every document, even if its output is up to date.")
+    return parser.parse_args(argv)
 
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith((".doc", ".docx")):
-            input_path = os.path.join(folder_path, filename)
-            convert_single_document(input_path)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "convert-file":
+        convert_single_document(args.input_path, args.output_path)
+        return 0
+    summary = convert_folder(args.folder_path, args.output_dir, args.workers or None,
+                             args.office_workers, args.force)
+    if summary is None:
+        return 1
+    return 1 if summary['failed'] else 0
 
 if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python extractor.py <command> [<args>]")
-        print("Commands:")
-        print("  convert-file <input_path> [<output_path>]")
-        print("  convert-folder <folder_path>")
-        sys.exit(1)
-
-    command = sys.argv[1]
-
-    if command == "convert-file":
-        if len(sys.argv) < 3:
-            print("Usage: python extractor.py convert-file <input_path> [<output_path>]")
-            sys.exit(1)
-        input_file = sys.argv[2]
-        output_file = sys.argv[3] if len(sys.argv) > 3 else None
-        convert_single_document(input_file, output_file)
-    elif command == "convert-folder":
-        if len(sys.argv) < 3:
-            print("Usage: python extractor.py convert-folder <folder_path>")
-            sys.exit(1)
-        folder = sys.argv[2]
-        convert_folder(folder)
-    else:
-        print(f"Unknown command: {command}")
-        sys.exit(1)
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+
+def snapshot(file_paths):
+    """Returns {path: (size, mtime_ns)} for the given files, skipping any that vanished."""
+    state = {}
+    for path in file_paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        state[path] = (st.st_size, st.st_mtime_ns)
+    return state
+
+
+def changed_paths(old, new):
+    """Returns the paths that were added, removed or modified between two snapshots."""
+    changed = {path for path, info in new.items() if old.get(path) != info}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+async def watch_folders(sources, poll_interval=1.0, debounce=2.0):
+    """
+    Polls watched folders and yields {name: set of changed paths} once writes settle.
+
+    sources maps a name to a callable that lists that folder's files. Every
+    poll_interval seconds the files are stat'ed and compared with the previous
+    poll; changes are accumulated until nothing has changed for debounce seconds,
+    so a burst of writes (a reviewer saving repeatedly, a folder being copied in)
+    is reported once, after the files are complete.
+    """
+    loop = asyncio.get_running_loop()
+    previous = {name: snapshot(list_files()) for name, list_files in sources.items()}
+    pending = {}
+    last_change = loop.time()
+
+    while True:
+        await asyncio.sleep(poll_interval)
+        for name, list_files in sources.items():
+            current = snapshot(list_files())
+            changed = changed_paths(previous[name], current)
+            previous[name] = current
+            if changed:
+                pending.setdefault(name, set()).update(changed)
+                last_change = loop.time()
+
+        if pending and loop.time() - last_change >= debounce:
+            yield pending
+            pending = {}
@@ -0,0 +1,99 @@
+import re
+
+from text_cleaning import clean_text
+
+# "Section 20: Budget", "20. Budget", "20 (16). Budget", "20 Budget" ...
+_NUMBERED_HEADER = re.compile(r'(?:section\s*)?(\d+)\s*(?:\((\d+)\))?\s*[.:)\-–—]?\s*(.+)', re.IGNORECASE)
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_title(title):
+    """Case-folds a header title, spells out '&' and drops punctuation and extra spaces."""
+    title = title.casefold().replace('&', ' and ')
+    return ' '.join(_NON_WORD.sub(' ', title).split())
+
+
+def _split_numbered(line):
+    """Returns (numbers, normalized title) for a numbered header line, or None."""
+    match = _NUMBERED_HEADER.fullmatch(line)
+    if not match:
+        return None
+    numbers = {int(match.group(1))}
+    if match.group(2):
+        numbers.add(int(match.group(2)))
+    return numbers, normalize_title(match.group(3))
+
+
+class HeaderMatcher:
+    """
+    Matches document lines against one application type's section headers.
+
+    Lookups are O(1) per line: an exact dict of the cleaned header variants is
+    tried first, then lines that start like a numbered header are split into
+    their numbers and a normalized title and looked up by title. A title match
+    only counts if one of the line's numbers is a number that section uses, so
+    "20 (16). Budget" matches a section numbered 16 or 20, but a reviewer's
+    "3. Budget" list item does not.
+    """
+
+    def __init__(self, app_type, exact, titles):
+        self.app_type = app_type
+        self._exact = exact    # cleaned variant -> canonical key
+        self._titles = titles  # normalized title -> (canonical key, frozenset of numbers)
+
+    def match(self, line):
+        """Returns the canonical section key for a header line, or None."""
+        key = self._exact.get(line)
+        if key is not None:
+            return key
+        first = line[:1]
+        if not (first.isdigit() or first in 'sS'):
+            return None
+        parts = _split_numbered(line)
+        if parts is None:
+            return None
+        numbers, title = parts
+        entry = self._titles.get(title)
+        if entry is None or numbers.isdisjoint(entry[1]):
+            return None
+        return entry[0]
+
+    __call__ = match
+
+
+class HeaderIndex:
+    """
+    Header lookup tables built once from section_definitions, one HeaderMatcher
+    per application type, so headers of one type never shadow another's.
+    """
+
+    def __init__(self, matchers, definitions_fingerprint):
+        self.matchers = matchers
+        self.definitions_fingerprint = definitions_fingerprint
+
+    @classmethod
+    def from_definitions(cls, definitions, definitions_fingerprint):
+        """Builds the matchers from {app_type: {canonical key: header variants}}."""
+        matchers = {}
+        for app_type, sections in definitions.items():
+            exact = {}
+            titles = {}
+            for canonical_name, variations in sections.items():
+                for variation in variations:
+                    cleaned = clean_text(variation)
+                    exact[cleaned] = canonical_name
+                    parts = _split_numbered(cleaned)
+                    if parts is None:
+                        continue
+                    numbers, title = parts
+                    _, known_numbers = titles.get(title, (canonical_name, frozenset()))
+                    titles[title] = (canonical_name, known_numbers | numbers)
+            matchers[app_type] = HeaderMatcher(app_type, exact, titles)
+        return cls(matchers, definitions_fingerprint)
+
+    def matcher(self, app_type):
+        return self.matchers[app_type]
+
+    def fingerprint(self):
+        """A stable digest of the definitions, for invalidating stored results."""
+        return self.definitions_fingerprint
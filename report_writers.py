@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import os
+
+REPORT_TITLE = "Charter Application Review Comments Compilation"
+KIND_LABELS = (('strengths', 'Strengths'), ('concerns', 'Concerns'))
+FIELDNAMES = ('school', 'section', 'title', 'kind', 'reviewer', 'comment')
+
+
+def iter_report_sections(data, canonical_order):
+    """
+    Yields (section_key, title, [(kind, label, entries), ...]) for every section
+    with comments, in canonical order. Only kinds with entries are included.
+    Entries are used in the order they are stored; CommentAggregator keeps them
+    ordered by reviewer, so no sorting happens here.
+    """
+    for section_key in canonical_order:
+        section = data.get(section_key)
+        if not section:
+            continue
+        kinds = [(kind, label, section[kind]) for kind, label in KIND_LABELS if section[kind]]
+        if kinds:
+            yield section_key, section.get('title', section_key), kinds
+
+
+def _entry_school(entry, school):
+    """The school a comment came from: its own, else the report's."""
+    return entry.get('school') or school
+
+
+def iter_report_rows(data, canonical_order, school=None):
+    """
+    Yields one flat dict per comment, in report order, for the tabular formats.
+    Each row names its comment's school, so rows from a report that mixes
+    schools can be told apart.
+    """
+    for section_key, title, kinds in iter_report_sections(data, canonical_order):
+        for kind, _, entries in kinds:
+            for entry in entries:
+                yield {'school': _entry_school(entry, school), 'section': section_key, 'title': title,
+                       'kind': kind, 'reviewer': entry['reviewer'], 'comment': entry['comment']}
+
+
+def iter_markdown(data, canonical_order, school=None):
+    """Yields the Markdown report in chunks."""
+    yield f"# {REPORT_TITLE}\n\n"
+    for _, title, kinds in iter_report_sections(data, canonical_order):
+        yield f"## {title}\n\n"
+        for _, label, entries in kinds:
+            yield f"### {label}\n"
+            yield "".join(f"- {entry['reviewer']}: {entry['comment']}\n" for entry in entries)
+            yield "\n"
+
+
+def iter_json(data, canonical_order, school=None):
+    """Yields the report as one JSON document: sections with their strengths and concerns."""
+    sections = []
+    for section_key, title, kinds in iter_report_sections(data, canonical_order):
+        section = {'key': section_key, 'title': title}
+        for kind, _, entries in kinds:
+            section[kind] = [{'school': _entry_school(e, school), 'reviewer': e['reviewer'], 'comment': e['comment']}
+                             for e in entries]
+        sections.append(section)
+    report = {'title': REPORT_TITLE, 'sections': sections}
+    if school is not None:
+        report['school'] = school
+    yield json.dumps(report, ensure_ascii=False, indent=2)
+    yield "\n"
+
+
+def iter_jsonl(data, canonical_order, school=None):
+    """Yields one JSON object per comment and line."""
+    for row in iter_report_rows(data, canonical_order, school):
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_csv(data, canonical_order, school=None):
+    """Yields the report as CSV with one row per comment."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(iter_report_rows(data, canonical_order, school))
+    yield buffer.getvalue()
+
+
+TEXT_FORMATS = {
+    'md': iter_markdown,
+    'json': iter_json,
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+}
+REPORT_FORMATS = tuple(TEXT_FORMATS) + ('docx',)
+
+
+def _write_docx(data, canonical_order, path, school=None):
+    """Writes the report as a Word document with python-docx (imported only when used)."""
+    from docx import Document
+
+    document = Document()
+    document.add_heading(REPORT_TITLE if school is None else f"{REPORT_TITLE}: {school}", 0)
+    for _, title, kinds in iter_report_sections(data, canonical_order):
+        document.add_heading(title, 1)
+        for _, label, entries in kinds:
+            document.add_heading(label, 2)
+            for entry in entries:
+                document.add_paragraph(f"{entry['reviewer']}: {entry['comment']}", style='List Bullet')
+    document.save(path)
+
+
+def write_report(data, canonical_order, path, fmt, school=None):
+    """
+    Renders the aggregated comments in fmt and writes them to path with a single
+    buffered write. The file is written under a temporary name and moved into
+    place, so it is never seen half-written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == 'docx':
+        _write_docx(data, canonical_order, tmp_path, school)
+    else:
+        # csv writes its own line endings, so no newline translation.
+        newline = '' if fmt == 'csv' else None
+        with open(tmp_path, 'w', encoding='utf-8', newline=newline) as f:
+            f.write("".join(TEXT_FORMATS[fmt](data, canonical_order, school)))
+    os.replace(tmp_path, path)
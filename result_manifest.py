@@ -0,0 +1,78 @@
+import json
+import os
+
+MANIFEST_FORMAT = 1
+
+
+class ResultManifest:
+    """
+    Persistent record of each evaluation file's parsed result.
+
+    Entries are keyed by file name and validated against the file's size and
+    mtime, so only new or changed files need to be re-parsed. The whole manifest
+    is tied to a fingerprint of everything that affects parsing (extractor and
+    parser versions, header map, boilerplate); when the fingerprint changes all
+    stored results are discarded.
+    """
+
+    def __init__(self, path, fingerprint, rebuild=False):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries = {}  # file name -> {'size', 'mtime_ns', 'result'}
+        self.dirty = False
+        if not rebuild:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') != MANIFEST_FORMAT or data.get('fingerprint') != self.fingerprint:
+            self.dirty = True
+            return
+        self.entries = data.get('entries', {})
+
+    def lookup(self, file_path):
+        """Returns the stored result for file_path if the file is unchanged, else None."""
+        entry = self.entries.get(os.path.basename(file_path))
+        if entry is None:
+            return None
+        st = os.stat(file_path)
+        if entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+            return None
+        return entry['result']
+
+    def store(self, file_path, result):
+        """Records the parsed result for file_path against its current size and mtime."""
+        st = os.stat(file_path)
+        # Cache records, timings and debug text describe this run, not the file's parsed result.
+        stored = {k: v for k, v in result.items() if k not in ('cache_record', 'metrics', 'debug_text')}
+        self.entries[os.path.basename(file_path)] = {
+            'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'result': stored
+        }
+        self.dirty = True
+
+    def prune(self, file_paths):
+        """Drops results for files that are no longer present. Returns the number dropped."""
+        present = {os.path.basename(p) for p in file_paths}
+        removed = [name for name in self.entries if name not in present]
+        for name in removed:
+            del self.entries[name]
+        if removed:
+            self.dirty = True
+        return len(removed)
+
+    def save(self):
+        """Writes the manifest atomically if anything changed."""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': MANIFEST_FORMAT, 'fingerprint': self.fingerprint, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,200 @@
+import contextlib
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kib(who=None):
+    """Peak resident set size of this process (or its finished children) in KiB, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class FileMetrics:
+    """
+    Stage timings and counters for one evaluation file. lap(stage) charges the
+    time since the previous lap to stage, so a file's stages add up to its total.
+    Collected inside worker processes and returned with the file's result.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def move_time(self, from_stage, to_stage, seconds):
+        """Re-attributes seconds measured inside from_stage's lap to to_stage."""
+        self.stages[from_stage] = self.stages.get(from_stage, 0.0) - seconds
+        self.stages[to_stage] = self.stages.get(to_stage, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        return {
+            'seconds': time.perf_counter() - self._start,
+            'stages': self.stages,
+            'counters': self.counters,
+            'peak_rss_kib': peak_rss_kib(),
+        }
+
+
+class _NullFileMetrics:
+    """Stands in for FileMetrics when metrics are off, so instrumented code needs no checks."""
+
+    def lap(self, stage):
+        pass
+
+    def move_time(self, from_stage, to_stage, seconds):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def as_dict(self):
+        return None
+
+
+NULL_FILE_METRICS = _NullFileMetrics()
+
+
+def file_metrics(enabled):
+    return FileMetrics() if enabled else NULL_FILE_METRICS
+
+
+class RunMetrics:
+    """
+    Collects run-level stage timings and per-file metrics and writes them as JSON
+    lines: one "stage" record per run stage, one "file" record per evaluation and
+    a final "summary" with totals, the slowest files and peak memory.
+
+    With path=None everything is a no-op, so main() can instrument unconditionally.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = path is not None
+        self.records = []
+        self.extra = {}
+        self._start = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager that times one run stage (template loading, report writing, ...)."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append({'event': 'stage', 'stage': name, 'seconds': time.perf_counter() - start})
+
+    def record_file(self, result, reused=False, counters=None):
+        """Adds a file record from a per-file result (and any counters measured while merging it)."""
+        if not self.enabled:
+            return
+        record = {'event': 'file', 'file': result['filename'], 'status': result['status'], 'reused': reused}
+        if result.get('school'):
+            record['school'] = result['school']
+        metrics = result.get('metrics')
+        if metrics:
+            record.update(metrics)
+        if counters:
+            record['counters'] = dict(record.get('counters', {}), **counters)
+        self.records.append(record)
+
+    def summary(self):
+        files = [r for r in self.records if r['event'] == 'file']
+        file_stages = {}
+        counters = {}
+        for record in files:
+            for stage, seconds in record.get('stages', {}).items():
+                file_stages[stage] = file_stages.get(stage, 0.0) + seconds
+            for name, n in record.get('counters', {}).items():
+                counters[name] = counters.get(name, 0) + n
+        slowest = sorted((r for r in files if 'seconds' in r), key=lambda r: r['seconds'], reverse=True)[:5]
+        summary = {
+            'event': 'summary',
+            'seconds': time.perf_counter() - self._start,
+            'files': len(files),
+            'reused': sum(1 for r in files if r['reused']),
+            'run_stages': {r['stage']: r['seconds'] for r in self.records if r['event'] == 'stage'},
+            'file_stages': file_stages,
+            'counters': counters,
+            'slowest_files': [{'file': r['file'], 'seconds': r['seconds']} for r in slowest],
+            'peak_rss_kib': peak_rss_kib(),
+        }
+        if resource is not None:
+            summary['children_peak_rss_kib'] = peak_rss_kib(resource.RUSAGE_CHILDREN)
+        summary.update(self.extra)
+        return summary
+
+    def write(self):
+        """Writes all records plus the summary to path, one JSON object per line."""
+        if not self.enabled:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = [json.dumps(record) for record in self.records + [self.summary()]]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Run metrics written to {self.path}")
+
+
+@contextlib.contextmanager
+def profiling(profile_path=None, trace_memory=False, metrics=None):
+    """
+    Optionally runs the body under cProfile (stats saved to profile_path and the
+    top functions printed) and/or tracemalloc (peak and top allocation sites
+    printed and added to the metrics summary). Only this process is profiled;
+    worker processes are not.
+    """
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            import pstats
+            directory = os.path.dirname(profile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(profile_path)
+            print(f"\nProfile written to {profile_path}; top functions by cumulative time:")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            tracemalloc.stop()
+            print(f"\nPeak traced memory: {peak / (1024 * 1024):.1f} MiB; largest live allocations:")
+            for stat in top:
+                print(f"  {stat}")
+            if metrics is not None:
+                metrics.extra['tracemalloc_peak_kib'] = peak // 1024
+                metrics.extra['tracemalloc_top'] = [str(stat) for stat in top]
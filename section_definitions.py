@@ -1,12 +1,17 @@
 # This file is derived from the user-provided sample_ref_splitTextFiles.py
 # It contains the comprehensive section header definitions for different application types.
 
+import functools
+import hashlib
+from collections import namedtuple
+from types import MappingProxyType
+
 def basic_model_app():
     sections = {}
     sections["01-Mission"] = ["Section 1: Mission, Guiding Principles and Purpose", "1. Mission, Guiding Principles and Purpose"]
     sections["02-Target"] = ["Section 2: Target Population and Student Body", "2. Target Population and Student Body"]
     sections["03-Ed Design"] = ["Section 3: Educational Program Design", "3. Educational Program Design"]
-    sections["04-Curriculum"] = ["Section 4: Curriculum and Instructional Design", "4. Curriculum and Instructional Design"]
+    sections["04-Curriculum"] = ["Section 4: Curriculum and Instructional Design", "4. Curriculum and Instructional Design", "4. Curriculum Plan"]
     sections["05-Assessment"] = ["Section 5: Student Performance", "5. Student Performance, Assessment and Evaluation", "5. Student Performance"]
     sections["06-ESE"] = ["Section 6: Exceptional Students", "6. Exceptional Students"]
     sections["07-ESOL"] = ["Section 7: English Language Learners", "7. English Language Learners"]
@@ -19,7 +24,7 @@ def basic_model_app():
     sections["14-Recruitment"] = ["Section 14: Student Recruitment and Enrollment", "14. Student Recruitment and Enrollment"]
     sections["15-Parents"] = ["Section 15: Parent and Community Involvement", "15. Parent and Community Involvement"]
     sections["16-Facilities"] = ["Section 16: Facilities", "16. Facilities"]
-    sections["17-Transportation"] = ["Section 17: Transportation Service", "17. Transportation Service"]
+    sections["17-Transportation"] = ["Section 17: Transportation Service", "17. Transportation Service", "17. Transportation"]
     sections["18-Food Service"] = ["Section 18: Food Service", "18. Food Service"]
     sections["19-Safety"] = ["Section 19: School Safety and Security", "19. School Safety and Security"]
     sections["20-Budget"] = ["Section 20: Budget", "20. Budget", "20 (16). Budget"]
@@ -44,23 +49,76 @@ def virtual_model_app():
     sections["13-PD"] = ["Section 13: Professional Development", "13. Professional Development"]
     sections["14-Recruitment"] = ["Section 14: Student Recruitment and Enrollment", "14. Student Recruitment and Enrollment"]
     sections["15-Parents"] = ["Section 15: Parent and Community Involvement", "15. Parent and Community Involvement"]
-    sections["16-Budget"] = ["Section 16: Budget", "16. Budget"]
-    sections["17-Fiscal Management"] = ["Section 17: Financial Management and Oversight", "17. Financial Management and Oversight"]
-    sections["18-Start Up"] = ["Section 18: Start-Up Plan", "18. Start-Up Plan"]
+    # Keyed like the standard model's sections so reports line up across types.
+    sections["20-Budget"] = ["Section 16: Budget", "16. Budget", "20 (16). Budget"]
+    sections["21-Fiscal Management"] = ["Section 17: Financial Management and Oversight", "17. Financial Management and Oversight", "21 (17). Financial Management and Oversight"]
+    sections["22-Start Up"] = ["Section 18: Start-Up Plan", "18. Start-Up Plan", "22 (18). Start-Up Plan"]
     return sections
 
 def high_performing_app():
     sections = {}
     sections["25-Replication"] = ["Section 1: Replication Overview", "1. Replication Overview"]
     sections["01-Mission"] = ["Section 2: Mission Guiding Principles and Purpose", "2. Mission Guiding Principles and Purpose"]
-    sections["03-Ed Design"] = ["Section 3: Educational Program, Curriculum, and Instructional Design", "3. Educational Program, Curriculum, and Instructional Design"]
-    sections["05-Assessment"] = ["Section 4: Student Performance", "4. Student Performance"]
+    sections["03-Ed Design"] = ["Section 3: Educational Program, Curriculum, and Instructional Design", "3. Educational Program, Curriculum, and Instructional Design", "3. Educational Program Design, Curriculum, & Intructional Design"]
+    sections["05-Assessment"] = ["Section 4: Student Performance", "4. Student Performance", "4. Student Performance, Assessment and Evaluation"]
     sections["14-Recruitment"] = ["Section 5: Student Recruitment and Enrollment", "5. Student Recruitment and Enrollment"]
     sections["11-Management"] = ["Section 6: Management and Staffing", "6. Management and Staffing"]
     sections["16-Facilities"] = ["Section 7: Facilities", "7. Facilities"]
-    sections["17-Transportation"] = ["Section 8: Transportation Service", "8. Transportation Service"]
+    sections["17-Transportation"] = ["Section 8: Transportation Service", "8. Transportation Service", "8. Transportation"]
     sections["18-Food Service"] = ["Section 9: Food Service", "9. Food Service"]
     sections["19-Safety"] = ["Section 10: School Safety and Security", "10. School Safety and Security"]
     sections["20-Budget"] = ["Section 11: Budget", "11. Budget"]
     sections["21-Fiscal Management"] = ["Section 12: Financial Management and Oversight", "12. Financial Management and Oversight"]
-    return sections
\ No newline at end of file
+    return sections
+
+# Application types in report order: the standard model's sections come first,
+# then any sections only the later types define.
+APPLICATION_TYPES = (
+    ("standard", basic_model_app),
+    ("virtual", virtual_model_app),
+    ("high_performing", high_performing_app),
+)
+
+UNKNOWN_SECTION_TITLE = "Unknown Section"
+
+# titles: canonical key -> report title (first variant of the first type defining it)
+# order: canonical keys in report order; positions: canonical key -> index in order
+# variants: application type -> {canonical key: tuple of header variants}
+# fingerprint: stable digest of all variants, for invalidating stored results
+SectionTable = namedtuple('SectionTable', 'titles order positions variants fingerprint')
+
+
+def build_section_table():
+    """Builds the read-only SectionTable from the application type definitions."""
+    titles = {}
+    variants = {}
+    for app_type, definitions in APPLICATION_TYPES:
+        sections = {key: tuple(variations) for key, variations in definitions().items()}
+        for key, variations in sections.items():
+            titles.setdefault(key, variations[0])
+        variants[app_type] = MappingProxyType(sections)
+
+    h = hashlib.sha256()
+    for app_type in sorted(variants):
+        for key, variations in sorted(variants[app_type].items()):
+            h.update(f"{app_type}\0{key}\0{chr(1).join(variations)}\0".encode('utf-8'))
+
+    order = tuple(titles)
+    return SectionTable(
+        titles=MappingProxyType(titles),
+        order=order,
+        positions=MappingProxyType({key: position for position, key in enumerate(order)}),
+        variants=MappingProxyType(variants),
+        fingerprint=h.hexdigest(),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def section_table():
+    """The SectionTable, built on first use and shared for the life of the process."""
+    return build_section_table()
+
+
+def section_title(section_key):
+    """The report title of a canonical section key."""
+    return section_table().titles.get(section_key, UNKNOWN_SECTION_TITLE)
@@ -0,0 +1,160 @@
+import re
+
+# All patterns are compiled once at import time and shared by every parser.
+
+# Style A: a block of strengths followed by a block of concerns.
+_STYLE_A_STRENGTHS = re.compile(r'Strengths\n(.*?)(?=\nConcerns and Additional Questions|$)', re.DOTALL | re.IGNORECASE)
+_STYLE_A_CONCERNS = re.compile(r'Concerns and Additional Questions\n(.*)', re.DOTALL | re.IGNORECASE)
+# Case-insensitive regex searches cannot skip ahead on a literal prefix, so the
+# Style A patterns only run when a case-folded substring check finds a heading.
+# casefold() (plus dotless i) folds every character IGNORECASE would equate.
+_STYLE_A_MARKERS = ('strengths\n', 'concerns and additional questions\n')
+
+# Equivalent to r'\b(?:page|p\. |p\.|pg\.)\s*(\d+)(?:\s*-\s*(\d+))?\b' with
+# IGNORECASE, but starting on a [Pp] character class lets the regex engine skip
+# quickly to candidate positions; the lookbehind keeps the leading word boundary.
+_PAGE_NUMBER = re.compile(r'[Pp](?<=\b[Pp])(?:[Aa][Gg][Ee]|\. |\.|[Gg]\.)\s*(\d+)(?:\s*-\s*(\d+))?\b')
+
+# Style B/C keyword lines ("Strength", "Concern: ...", ...) and the mode each one starts.
+MODE_KEYWORDS = {
+    'strength': 'strength',
+    'concern': 'concern',
+    'question': 'concern',
+    'follow up': 'concern',
+    'improvement': 'concern',
+}
+
+# Joins a section's comments for the bulk page-number pass. It is not whitespace
+# or a word character, so no page-number match can span two comments and word
+# boundaries at comment edges behave exactly as at the start/end of a string.
+_BULK_SEPARATOR = '\x00'
+
+
+def _has_style_a_marker(section_text):
+    folded = section_text.casefold().replace('\u0131', 'i')
+    return any(marker in folded for marker in _STYLE_A_MARKERS)
+
+
+def _page_number_replacement(match):
+    start_page, end_page = match.group(1), match.group(2)
+    if end_page:
+        return f'[p. {start_page}-{end_page}]'
+    return f'[p. {start_page}]'
+
+
+def format_page_numbers(comment_text):
+    """Finds and reformats page number mentions in comment text."""
+    return _PAGE_NUMBER.sub(_page_number_replacement, comment_text)
+
+
+def format_page_numbers_bulk(comments):
+    """Applies format_page_numbers to a list of comments with a single regex pass."""
+    if not comments:
+        return []
+    joined = _BULK_SEPARATOR.join(comments)
+    if joined.count(_BULK_SEPARATOR) != len(comments) - 1:
+        return [format_page_numbers(comment) for comment in comments]
+    return _PAGE_NUMBER.sub(_page_number_replacement, joined).split(_BULK_SEPARATOR)
+
+
+class SectionParser:
+    """
+    Extracts strengths and concerns from a section's text, using Style A blocks
+    when present and otherwise the line-by-line Style B/C state machine.
+
+    Keyword lines are dispatched through a dict lookup (keywords maps a lower-case
+    keyword to 'strength' or 'concern'), and page numbers are reformatted in one
+    pass per section.
+    """
+
+    def __init__(self, keywords=None):
+        self.keywords = MODE_KEYWORDS if keywords is None else keywords
+
+    def parse(self, section_text, reviewer_name):
+        """Returns {'strengths': [...], 'concerns': [...]} of {'reviewer', 'comment'} entries."""
+        match_strength_a = match_concern_a = None
+        if _has_style_a_marker(section_text):
+            match_strength_a = _STYLE_A_STRENGTHS.search(section_text)
+            match_concern_a = _STYLE_A_CONCERNS.search(section_text)
+        if match_strength_a or match_concern_a:
+            strengths = self._block_lines(match_strength_a)
+            concerns = self._block_lines(match_concern_a)
+        else:
+            strengths, concerns = self._parse_keyword_lines(section_text)
+
+        formatted = format_page_numbers_bulk(strengths + concerns)
+        return {
+            'strengths': self._unique_entries(formatted[:len(strengths)], reviewer_name),
+            'concerns': self._unique_entries(formatted[len(strengths):], reviewer_name),
+        }
+
+    @staticmethod
+    def _block_lines(match):
+        if not match:
+            return []
+        return [line.strip() for line in match.group(1).strip().splitlines() if line.strip()]
+
+    def _parse_keyword_lines(self, section_text):
+        """Style B/C: keyword lines switch mode; following lines form one comment."""
+        keywords = self.keywords
+        comments = {'strength': [], 'concern': []}
+        current_mode = None
+        current_comment_lines = []
+
+        for line in section_text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            line_lower = line.lower()
+            mode = keywords.get(line_lower)
+            comment_text = None
+            if mode is None:
+                keyword, colon, _ = line_lower.partition(':')
+                if colon:
+                    mode = keywords.get(keyword)
+                    if mode is not None:
+                        comment_text = line.split(':', 1)[1].strip()
+
+            if mode is None:
+                if current_mode:
+                    # This line is part of the ongoing comment
+                    current_comment_lines.append(line)
+                continue
+
+            if current_comment_lines:
+                comment = "\n".join(current_comment_lines).strip()
+                if comment and current_mode:
+                    comments[current_mode].append(comment)
+                current_comment_lines = []
+            current_mode = mode
+            if comment_text:
+                current_comment_lines.append(comment_text)
+
+        # Save any remaining comment after the loop finishes
+        if current_comment_lines and current_mode:
+            comment = "\n".join(current_comment_lines).strip()
+            if comment:
+                comments[current_mode].append(comment)
+        return comments['strength'], comments['concern']
+
+    @staticmethod
+    def _unique_entries(comment_texts, reviewer_name):
+        entries = []
+        seen = set()
+        for text in comment_texts:
+            if text and text not in seen:
+                entries.append({'reviewer': reviewer_name, 'comment': text})
+                seen.add(text)
+        return entries
+
+
+_DEFAULT_PARSER = SectionParser()
+
+
+def parse_section(section_text, reviewer_name):
+    """
+    Parses a single section's text to extract strengths and concerns
+    based on Style A or a more complex, multi-line Style B/C formatting.
+    """
+    return _DEFAULT_PARSER.parse(section_text, reviewer_name)
@@ -0,0 +1,26 @@
+def clean_line(line):
+    """
+    Collapses each run of whitespace in a single line to one space and strips it.
+    str.split() with no separator treats every Unicode whitespace character
+    (tabs, non-breaking spaces, em spaces, ...) as a separator.
+    """
+    return ' '.join(line.split())
+
+
+def clean_lines(text):
+    """
+    Normalizes text into a list of non-blank lines in a single linear pass:
+    runs of whitespace (including tabs and non-breaking spaces) become one space,
+    each line is stripped, and blank lines are dropped.
+    """
+    if not text:
+        return []
+    return [' '.join(words) for words in map(str.split, text.splitlines()) if words]
+
+
+def clean_text(text):
+    """
+    Normalizes whitespace by replacing tabs and multiple spaces with a single space.
+    Lines are stripped and blank lines removed.
+    """
+    return "\n".join(clean_lines(text))